@@ -0,0 +1,119 @@
+import numpy as np
+import os
+import struct
+
+
+# Must match ea/log.py
+BINARY_LOG_MAGIC = b'LUPLOG1\n'
+BINARY_BLOCK_HEADER = '<iq'
+
+
+class LogReader:
+    def __init__(self, log_file_path):
+        """Initializes the LogReader class, loading the run data of the log at log_file_path.
+
+        Text logs are streamed line by line. If the log was written with a log_format of binary
+        (or log_file_path is the .bin file itself), the binary run data file is memory-mapped instead.
+
+        self.runs is a list of (run count, evals, average fitnesses, best fitnesses) tuples in run
+        order, where the last three are NumPy arrays.
+        """
+        self.log_file_path = log_file_path
+        self.runs = []
+
+        binary_log_file_path = os.path.splitext(log_file_path)[0] + '.bin'
+
+        if log_file_path.endswith('.bin') or self.uses_binary_format():
+            self.read_binary(binary_log_file_path)
+        else:
+            self.read_text()
+
+
+    def uses_binary_format(self):
+        """Returns True if the config header of the text log says its run data is binary."""
+        with open(self.log_file_path, 'r') as log_file:
+            for line in log_file:
+                if line.startswith('log_format: '):
+                    return line.split()[1] == 'binary'
+
+                if line.startswith('Result Log'):
+                    break
+
+        return False
+
+
+    def read_text(self):
+        """Reads the run data lines of a text log into self.runs."""
+        run_count = None
+        data_lines = []
+
+        def store_run():
+            """Converts the data lines collected for the current run to arrays."""
+            if run_count is not None:
+                data = np.array(' '.join(data_lines).split(), dtype=np.float64).reshape(-1, 3)
+                self.runs.append((run_count, data[:, 0].astype(np.int64), data[:, 1], data[:, 2]))
+
+
+        with open(self.log_file_path, 'r') as log_file:
+            # Skip the config parameters
+            for line in log_file:
+                if line.startswith('Result Log'):
+                    break
+
+            for line in log_file:
+                if line.startswith('Run '):
+                    store_run()
+                    run_count = int(line.split()[1])
+                    data_lines = []
+
+                elif line[:1].isdigit():
+                    # This line has eval and fitness data
+                    data_lines.append(line)
+
+        store_run()
+
+
+    def read_binary(self, binary_log_file_path):
+        """Reads the blocks of a binary run data file into self.runs."""
+        data = np.memmap(binary_log_file_path, dtype=np.uint8, mode='r')
+
+        if bytes(data[:len(BINARY_LOG_MAGIC)]) != BINARY_LOG_MAGIC:
+            raise ValueError(binary_log_file_path + ' is not a binary run data file')
+
+        # Runs may be split over several blocks, so collect each run's blocks first
+        run_blocks = {}
+        header_size = struct.calcsize(BINARY_BLOCK_HEADER)
+        position = len(BINARY_LOG_MAGIC)
+
+        while position < len(data):
+            run_count, num_records = struct.unpack(BINARY_BLOCK_HEADER, bytes(data[position:position + header_size]))
+            position += header_size
+
+            columns = []
+            for dtype in ('<i8', '<f8', '<f8'):
+                columns.append(np.frombuffer(data, dtype=dtype, count=num_records, offset=position))
+                position += 8 * num_records
+
+            run_blocks.setdefault(run_count, []).append(columns)
+
+        for run_count, blocks in run_blocks.items():
+            self.runs.append((run_count,) + tuple(np.concatenate([block[i] for block in blocks]) for i in range(3)))
+
+
+    def get_mean_fitnesses_by_eval(self):
+        """Returns a tuple of arrays (evals, average fitnesses, best fitnesses) where the fitnesses are
+        averaged over every run that logged each evaluation number.
+        """
+        all_evals = np.concatenate([run[1] for run in self.runs])
+        all_average_fitnesses = np.concatenate([run[2] for run in self.runs])
+        all_best_fitnesses = np.concatenate([run[3] for run in self.runs])
+
+        evals, eval_indices = np.unique(all_evals, return_inverse=True)
+        counts = np.bincount(eval_indices)
+
+        return evals, np.bincount(eval_indices, all_average_fitnesses) / counts, np.bincount(eval_indices, all_best_fitnesses) / counts
+
+
+    def get_last_best_fitnesses(self):
+        """Returns an array of the last (local) best fitness logged in each run."""
+        return np.array([run[3][-1] for run in self.runs if len(run[3])])
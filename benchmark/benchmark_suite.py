@@ -0,0 +1,204 @@
+import ea.ea_driver as ea_driver_class
+import json
+import os
+import platform
+import puzzle.bitboard as bitboard_class
+import puzzle.light_up_puzzle as puzzle_class
+import random
+import time
+import util.config as config_class
+
+
+class BenchmarkSuite:
+    def __init__(self, config_file, board_sizes=(10, 50, 100, 200), population_sizes=(20, 100, 1000), num_generations=5, seed=0):
+        """Initializes the BenchmarkSuite class.
+
+        Where config_file is the configuration file the benchmarks are based on. Every benchmark uses a
+        randomly generated square board of each size in board_sizes and, for the EA operators, each
+        population size in population_sizes (with lambda half of mu). Every benchmark draws its random
+        numbers from seed so that all runs measure the same work.
+        """
+        self.config_file = config_file
+        self.board_sizes = board_sizes
+        self.population_sizes = population_sizes
+        self.num_generations = num_generations
+        self.seed = seed
+
+
+    def create_config(self, board_size, population_size=20):
+        """Returns a Config object for a board_size x board_size random board and a population of
+        population_size genotypes, seeded with self.seed, that writes its log and solution to os.devnull.
+        """
+        config = config_class.Config(self.config_file)
+
+        overrides = {
+            'generate_uniform_random_puzzle': '1',
+            'override_random_board_dimensions': '1',
+            'override_num_rows': str(board_size),
+            'override_num_cols': str(board_size),
+            'mu': str(population_size),
+            'lambda': str(max(population_size // 2, 1)),
+            'parent_population_size': str(population_size),
+            'num_evaluation_processes': '1',
+            'use_external_seed': '1',
+            'seed': str(self.seed),
+            'log_file_path': os.devnull,
+            'soln_file_path': os.devnull
+        }
+
+        for key, value in overrides.items():
+            config.set(key, value)
+
+        return config
+
+
+    def time_call(self, func, num_repeats=3):
+        """Returns the shortest time (in seconds) taken by func over num_repeats calls."""
+        times = []
+
+        for _ in range(num_repeats):
+            start_time = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start_time)
+
+        return min(times)
+
+
+    def run_puzzle_benchmarks(self, board_size):
+        """Returns a dictionary of benchmark names and times for the LightUpPuzzle hot paths on a
+        board_size x board_size board.
+        """
+        results = {}
+        config = self.create_config(board_size)
+        prefix = 'puzzle/%ix%i/' % (board_size, board_size)
+
+        results[prefix + 'init'] = self.time_call(lambda: puzzle_class.LightUpPuzzle(config, rng=random.Random(self.seed)))
+
+        rng = random.Random(self.seed)
+        puzzle = puzzle_class.LightUpPuzzle(config, rng=rng)
+        coords = [puzzle.get_random_coord(rng) for _ in range(1000)]
+
+        def place_bulbs():
+            """Attempts to place a bulb on each coordinate of coords, in order."""
+            bulbs = puzzle.create_bulbs()
+
+            for coord in coords:
+                puzzle.place_bulb(coord, bulbs)
+
+            return bulbs
+
+        results[prefix + 'place_bulb_x1000'] = self.time_call(place_bulbs)
+
+        bulbs_list = [place_bulbs() for _ in range(10)]
+
+        # Evaluate from scratch, as for bulbs that do not track their lighting
+        untracked_bulbs_list = []
+
+        for bulbs in bulbs_list:
+            if isinstance(bulbs, bitboard_class.Bitboard):
+                bulbs = bitboard_class.Bitboard(puzzle, bulbs.mask)
+
+            untracked_bulbs_list.append(bulbs)
+
+        results[prefix + 'check_valid_solution_x10'] = self.time_call(lambda: [puzzle.check_valid_solution(bulbs) for bulbs in untracked_bulbs_list])
+
+        return results
+
+
+    def run_driver_benchmarks(self, board_size, population_size):
+        """Returns a dictionary of benchmark names and mean times per generation for each EADriver
+        operator on a board_size x board_size board with a population of population_size.
+        """
+        config = self.create_config(board_size, population_size)
+        prefix = 'driver/%ix%i/mu%i/' % (board_size, board_size, population_size)
+
+        start_time = time.perf_counter()
+        ea_driver = ea_driver_class.EADriver(config)
+        init_time = time.perf_counter() - start_time
+
+        ea_driver.evaluate(ea_driver.population, log_run=False)
+
+        operators = [
+            ('select_parents', ea_driver.select_parents),
+            ('recombine', ea_driver.recombine),
+            ('mutate', ea_driver.mutate),
+            ('evaluate', lambda: ea_driver.evaluate(ea_driver.children, log_run=False)),
+            ('select_for_survival', ea_driver.select_for_survival)
+        ]
+
+        total_times = dict((name, 0.0) for name, _ in operators)
+
+        for _ in range(self.num_generations):
+            for name, operator in operators:
+                start_time = time.perf_counter()
+                operator()
+                total_times[name] += time.perf_counter() - start_time
+
+        ea_driver.shutdown()
+
+        results = {prefix + 'init': init_time}
+
+        for name, total_time in total_times.items():
+            results[prefix + name] = total_time / self.num_generations
+
+        results[prefix + 'generation'] = sum(total_times.values()) / self.num_generations
+
+        return results
+
+
+    def run(self, progress=print):
+        """Runs every benchmark, reporting each result through progress.
+
+        Returns a dictionary of benchmark names and times (in seconds).
+        """
+        results = {}
+
+        for board_size in self.board_sizes:
+            benchmark_results = self.run_puzzle_benchmarks(board_size)
+
+            for population_size in self.population_sizes:
+                benchmark_results.update(self.run_driver_benchmarks(board_size, population_size))
+
+            for name, seconds in benchmark_results.items():
+                progress('%-50s %.6f s' % (name, seconds))
+
+            results.update(benchmark_results)
+
+        return results
+
+
+    def save(self, results, baseline_file_path):
+        """Writes results to baseline_file_path in JSON format."""
+        baseline = {
+            'python_version': platform.python_version(),
+            'seed': self.seed,
+            'num_generations': self.num_generations,
+            'results': results
+        }
+
+        with open(baseline_file_path, 'w') as baseline_file:
+            json.dump(baseline, baseline_file, indent=4, sort_keys=True)
+
+
+    def load(self, baseline_file_path):
+        """Returns the benchmark results stored in baseline_file_path."""
+        with open(baseline_file_path, 'r') as baseline_file:
+            return json.load(baseline_file)['results']
+
+
+    def compare(self, baseline_results, results, tolerance=0.2):
+        """Compares results against baseline_results.
+
+        Returns a list of (name, baseline time, time, ratio) tuples for each benchmark that is more
+        than tolerance (a fraction) slower than its baseline.
+        """
+        slowdowns = []
+
+        for name in sorted(results):
+            if name in baseline_results and baseline_results[name] > 0:
+                ratio = results[name] / baseline_results[name]
+
+                if ratio > 1 + tolerance:
+                    slowdowns.append((name, baseline_results[name], results[name], ratio))
+
+        return slowdowns
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+
+import benchmark.benchmark_suite as benchmark_suite_class
+import sys
+import util.args as args_class
+
+
+if __name__ == '__main__':
+
+    # Process command line arguments
+    # mode is either 'record' (write a new baseline) or 'compare' (check against an existing baseline)
+    args = args_class.Arguments(2, ['record', 'benchmark/baseline.json'])
+    mode, baseline_file_path = args.get_args()
+
+
+    # Setup the benchmarks
+    benchmark_suite = benchmark_suite_class.BenchmarkSuite('config/default.cfg')
+
+
+    # Run the benchmarks
+    results = benchmark_suite.run()
+
+    if mode == 'record':
+        benchmark_suite.save(results, baseline_file_path)
+
+    else:
+        slowdowns = benchmark_suite.compare(benchmark_suite.load(baseline_file_path), results)
+
+        for name, baseline_time, new_time, ratio in slowdowns:
+            print('SLOWER: %s %.6f s -> %.6f s (x%.2f)' % (name, baseline_time, new_time, ratio))
+
+        if slowdowns:
+            sys.exit(1)
+
+        print('No slowdowns compared to ' + baseline_file_path)
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+
+import puzzle.corpus as corpus_class
+import puzzle.light_up_puzzle as puzzle_class
+import random
+import sys
+import util.args as args_class
+import util.config as config_class
+import util.seed as seed_class
+
+
+if __name__ == '__main__':
+
+    # Process command line arguments
+    args = args_class.Arguments(2, ['config/default.cfg', '100'])
+    config_file, num_instances = args.get_args()
+    num_instances = int(num_instances)
+
+
+    # Setup configuration
+    config = config_class.Config(config_file)
+    settings = config.get_settings()
+
+    if not settings.corpus_file_path:
+        sys.exit('config key corpus_file_path must name the corpus file to write')
+
+    # Constraint propagation is stored alongside each board, so boards are generated without it
+    config.set('use_constraint_propagation', '0')
+    seed = seed_class.Seed(config)
+
+
+    # Generate the boards, instance i being the board run i + 1 would generate
+    puzzles = []
+    seeds = []
+
+    for instance_id in range(num_instances):
+        seeds.append(seed.get_stream_seed(instance_id + 1, 'puzzle'))
+        puzzles.append(puzzle_class.LightUpPuzzle(config, rng=random.Random(seeds[-1])))
+
+
+    corpus_class.Corpus.write(settings.corpus_file_path, puzzles, seeds)
+
+    print('wrote %i instances to %s (seed: %s)' % (num_instances, settings.corpus_file_path, str(seed.val)))
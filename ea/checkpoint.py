@@ -0,0 +1,52 @@
+import os
+import pickle
+
+
+# Version of the checkpoint state, stored in every checkpoint
+CHECKPOINT_VERSION = 3
+
+
+class Checkpoint:
+    def __init__(self, checkpoint_file_path):
+        """Initializes the Checkpoint class.
+
+        Where checkpoint_file_path is the file checkpoints are written to and read from. A checkpoint
+        is a dictionary of the state of an experiment (see EADriver's get_checkpoint_state()).
+        """
+        self.checkpoint_file_path = checkpoint_file_path
+
+
+    def write(self, state):
+        """Replaces the checkpoint file with the dictionary state.
+
+        The state is written to a temporary file which is synced to disk and then renamed over the
+        checkpoint file, so a job killed while writing leaves the previous checkpoint intact.
+        """
+        temp_file_path = self.checkpoint_file_path + '.tmp'
+
+        with open(temp_file_path, 'wb') as checkpoint_file:
+            pickle.dump(dict(state, version=CHECKPOINT_VERSION), checkpoint_file, protocol=pickle.HIGHEST_PROTOCOL)
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+
+        os.replace(temp_file_path, self.checkpoint_file_path)
+
+
+    def read(self):
+        """Returns the state stored in the checkpoint file, or None if there is no checkpoint file."""
+        if not os.path.exists(self.checkpoint_file_path):
+            return None
+
+        with open(self.checkpoint_file_path, 'rb') as checkpoint_file:
+            state = pickle.load(checkpoint_file)
+
+        if state.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(self.checkpoint_file_path + ' is not a checkpoint of this version')
+
+        return state
+
+
+    def remove(self):
+        """Removes the checkpoint file (once the experiment it belongs to has finished)."""
+        if os.path.exists(self.checkpoint_file_path):
+            os.remove(self.checkpoint_file_path)
@@ -1,47 +1,104 @@
-import copy
+import ea.evaluation_pool as evaluation_pool_class
+import ea.fitness_cache as fitness_cache_class
 import ea.genotype as genotype_class
 import ea.log as log_class
+import ea.profiler as profiler_class
+import ea.selector as selector_class
 import math
+import puzzle.batch_evaluator as batch_evaluator_class
+import puzzle.bitboard as bitboard_class
+import puzzle.corpus as corpus_class
 import puzzle.light_up_puzzle as puzzle_class
-import random
+import puzzle.solver as solver_class
 import util.seed as seed_class
 
 
 class EADriver:
-    def __init__(self, config):
+    def __init__(self, config, run_count=1, buffer_output=False, phenotype=None, checkpoint=None, seed_val=None, stream_key=None):
         """Initializes the EADriver class.
         
-        Where config is a Config object. 
+        Where config is a Config object and run_count is the number of the first run.
+
+        If buffer_output is True, log records are kept in memory (see Log) and the solution file is
+        not written. This is used by worker processes performing runs in parallel (see RunPool).
+        If phenotype is given, the first run evolves bulbs for that puzzle instead of a new one.
+        If corpus_file_path is set, each run's puzzle is taken from that corpus (see Corpus).
+
+        Every random number is drawn from streams derived from the seed (see Seed.get_random()):
+        the config's, or seed_val if given. Worker processes pass the seed of the experiment as
+        seed_val. Populations sharing a seed and run, such as islands or the cells of a sweep, also
+        pass a stream_key of their own: they evolve on the same puzzle, but from their own streams.
+
+        If checkpoint (a Checkpoint) is given, the state of the experiment is written to it every
+        checkpoint_interval generations, and if it already holds a checkpoint, the experiment
+        continues exactly where that checkpoint was taken.
         """
 
         self.config = config
+        self.settings = config.get_settings()
+        self.buffer_output = buffer_output
 
         # Initialize the seed class
-        self.seed = seed_class.Seed(self.config)
+        self.seed = seed_class.Seed(self.config, seed_val)
+        self.stream_key = stream_key
 
-        self.population_size = int(self.config.settings['mu'])
-        self.offspring_pool_size = int(self.config.settings['lambda'])
+        self.population_size = self.settings.mu
+        self.offspring_pool_size = self.settings.offspring_pool_size
         
-        self.run_count = 1
+        self.run_count = run_count
         self.best_fit_global_genotype = genotype_class.Genotype()
+        self.evaluation_pool = None
+
+        if self.settings.enable_profiling:
+            # Time the operators of every run (see Profiler)
+            self.profiler = profiler_class.Profiler(self.settings.profile_file_path)
+        else:
+            self.profiler = None
+
+        if self.settings.corpus_file_path:
+            self.corpus = corpus_class.Corpus(self.settings.corpus_file_path)
+        else:
+            self.corpus = None
+
+        # Number of the run init_run_variables() prepares next, counting from 0
+        self.next_run_index = run_count - 1
+
+        self.checkpoint = checkpoint
+        checkpoint_state = checkpoint.read() if checkpoint is not None else None
 
-        self.init_run_variables()
+        if checkpoint_state is not None:
+            if checkpoint_state['settings'] != dict(self.config.settings):
+                raise ValueError(checkpoint.checkpoint_file_path + ' was written by an experiment with a different config')
 
-        # Initialize the log file class
-        self.log = log_class.Log(self.config, self.seed, self.phenotype, overwrite=True)
+            self.seed.val = checkpoint_state['seed']
+            self.run_count = checkpoint_state['run_count']
 
+            self.init_run_variables(puzzle_class.LightUpPuzzle(self.config, corpus_class.Corpus.decode_board(checkpoint_state['board'])), checkpoint_state)
 
-    def init_run_variables(self):
+            # Continue the log from the checkpoint
+            self.log = log_class.Log(self.config, self.seed, self.phenotype, buffer=self.buffer_output, resume_state=checkpoint_state['log'])
+
+        else:
+            self.init_run_variables(phenotype)
+
+            # Initialize the log file class
+            self.log = log_class.Log(self.config, self.seed, self.phenotype, overwrite=True, buffer=self.buffer_output)
+
+
+    def init_run_variables(self, phenotype=None, checkpoint_state=None):
         """Initializes run specific variables.
 
-        This function should be called before each run.
+        This function should be called before each run. The run uses the puzzle phenotype if given,
+        a new puzzle created from config otherwise. If checkpoint_state is given (see
+        get_checkpoint_state()), the population and run state are restored from it instead of being
+        created, so the run continues where the checkpoint was taken.
         """
 
         def force_adj_bulbs():
             """Places bulbs around black squares where there is only one valid
             bulb placement pattern.
             """
-            bulbs = set([])
+            bulbs = self.phenotype.create_bulbs()
 
             # Determine where to place bulbs
             for black_square in self.phenotype.black_squares:
@@ -56,7 +113,7 @@ class EADriver:
             
             # Save bulb placements to each genotype
             for genotype in self.population:
-                genotype.bulbs = copy.deepcopy(bulbs)
+                genotype.bulbs = bulbs.copy()
 
 
         def init_puzzles_with_bulbs():
@@ -67,13 +124,15 @@ class EADriver:
             for genotype_index in range(len(self.population)):
                 # Place bulbs until num_bulb_placement_failures failures are reached
                 failure_count = 0
-                while failure_count < int(self.config.settings['num_bulb_placement_failures']):
-                    if not self.phenotype.place_bulb_randomly(self.population[genotype_index].bulbs):
+                while failure_count < self.settings.num_bulb_placement_failures:
+                    if not self.phenotype.place_bulb_randomly(self.population[genotype_index].bulbs, self.init_random):
                         failure_count += 1
 
 
         self.max_run_fitness = 0
         self.eval_count = 0
+        self.generation_count = 0
+        self.run_started = False
         self.avg_fitness_ratio = 0.0
         self.total_fitnesses_seen = 0
         self.total_fitness_ratio_sum = 0
@@ -81,21 +140,78 @@ class EADriver:
         self.prev_avg_fitness_ratio = 0.0
         self.best_fit_local_genotype = genotype_class.Genotype()
 
+        # Random number streams of this run: one for the initial population, one for recombination
+        # and mutation, and one for selection (populations of a run share its puzzle, but not the others)
+        run_number = self.next_run_index + 1
+
+        self.init_random = self.seed.get_random(run_number, 'init', self.stream_key)
+        self.operator_random = self.seed.get_random(run_number, 'operators', self.stream_key)
+        self.selector = selector_class.Selector(self.seed.get_stream_seed(run_number, 'selection', self.stream_key))
+
         # Create/reset the base puzzle class (phenotype)
-        self.phenotype = puzzle_class.LightUpPuzzle(self.config)
+        if phenotype is not None:
+            self.phenotype = phenotype
+        elif self.corpus is not None:
+            # Load a prepared board instead of building one (a corpus_instance_id of -1 cycles through the corpus)
+            instance_id = self.settings.corpus_instance_id if self.settings.corpus_instance_id >= 0 else self.next_run_index % len(self.corpus)
+            self.phenotype = puzzle_class.LightUpPuzzle(self.config, self.corpus.get_board(instance_id))
+        else:
+            self.phenotype = puzzle_class.LightUpPuzzle(self.config, rng=self.seed.get_random(run_number, 'puzzle'))
 
-        # Create/reset the puzzle population: a list genotypes
-        self.population = []
-        for _ in range(self.population_size):
-            self.population.append(genotype_class.Genotype())
+        self.next_run_index += 1
+
+        # Compact form of the board for checkpoints, encoded when the first checkpoint of the run is taken
+        self.checkpoint_board = None
+
+        if self.settings.use_batch_evaluation:
+            # Evaluate whole lists of genotypes at once with NumPy
+            self.batch_evaluator = batch_evaluator_class.BatchEvaluator(self.phenotype)
+        else:
+            self.batch_evaluator = None
+
+        # The evaluation workers hold the previous run's puzzle
+        self.shutdown()
+
+        if self.settings.fitness_cache_size:
+            # Remember the fitness of recently seen bulb placements on this run's puzzle
+            self.fitness_cache = fitness_cache_class.FitnessCache(self.settings.fitness_cache_size)
+        else:
+            self.fitness_cache = None
+
+        num_evaluation_processes = self.settings.num_evaluation_processes
+
+        if num_evaluation_processes != 1:
+            # Evaluate genotypes in worker processes (num_evaluation_processes of 0 uses every CPU)
+            self.evaluation_pool = evaluation_pool_class.EvaluationPool(self.phenotype, num_evaluation_processes if num_evaluation_processes > 1 else None, self.settings.evaluation_chunk_size)
 
         self.parents = []
         self.children = []
 
-        if int(self.config.settings['force_validity']):
+        if checkpoint_state is not None:
+            # Continue the run the checkpoint was taken in
+            self.restore_checkpoint_state(checkpoint_state)
+            return
+
+        # Create/reset the puzzle population: a list genotypes
+        self.population = []
+        for _ in range(self.population_size):
+            self.population.append(genotype_class.Genotype(self.phenotype.create_bulbs()))
+
+        if self.settings.force_validity:
             # Use black square adjacency heuristic to force validity
             force_adj_bulbs()
         
+        if self.settings.num_solver_seeded_genotypes:
+            # Seed the first genotypes with the best bulb placement the exact solver finds within its budget
+            self.solver = solver_class.Solver(self.phenotype, self.settings.solver_max_nodes, self.settings.solver_max_seconds)
+            solver_bulb_mask = self.solver.solve()
+
+            if solver_bulb_mask is not None:
+                for genotype in self.population[:self.settings.num_solver_seeded_genotypes]:
+                    genotype.bulbs = self.phenotype.create_bulbs(solver_bulb_mask)
+        else:
+            self.solver = None
+
         init_puzzles_with_bulbs()
 
     
@@ -105,9 +221,10 @@ class EADriver:
 
         If log_run is True, the state of the experiment is written to the log file.
         """ 
-        for genotype in genotypes:
-            self.phenotype.check_valid_solution(genotype.bulbs)
-            genotype.fitness = self.phenotype.get_fitness()
+        fitnesses = self.get_fitnesses(genotypes)
+
+        for genotype_index, genotype in enumerate(genotypes):
+            genotype.fitness = fitnesses[genotype_index]
             genotype.fitness_ratio = genotype.fitness / (self.phenotype.num_rows * self.phenotype.num_cols - len(self.phenotype.black_squares))
 
             # Calculate average fitness
@@ -123,10 +240,11 @@ class EADriver:
                     self.best_fit_global_genotype = self.best_fit_local_genotype
 
                     # Write to solution file
-                    self.phenotype.write_to_soln_file(self.best_fit_global_genotype.bulbs)
+                    if not self.buffer_output:
+                        self.phenotype.write_to_soln_file(self.best_fit_global_genotype.bulbs)
             
             # Determine if the population fitness is stagnating
-            if math.isclose(self.avg_fitness_ratio, self.prev_avg_fitness_ratio, rel_tol=float(self.config.settings['termination_convergence_criterion_magnitude'])):
+            if math.isclose(self.avg_fitness_ratio, self.prev_avg_fitness_ratio, rel_tol=self.settings.termination_convergence_criterion_magnitude):
                 self.stale_fitness_count += 1
             else:
                 self.stale_fitness_count = 0
@@ -138,6 +256,231 @@ class EADriver:
             self.log.write_run_data(self.eval_count, self.avg_fitness_ratio, self.best_fit_local_genotype.fitness_ratio)
 
 
+    def get_fitnesses(self, genotypes):
+        """Returns a list of the fitness of each genotype in the list genotypes.
+
+        Fitnesses are looked up in the fitness cache first (if enabled). The remaining genotypes are
+        evaluated by the evaluation pool, the batch evaluator or the phenotype, depending on config.
+        """
+        fitnesses = [None] * len(genotypes)
+
+        if self.fitness_cache:
+            keys = [self.phenotype.get_bulb_mask(genotype.bulbs) for genotype in genotypes]
+
+            for genotype_index in range(len(genotypes)):
+                fitnesses[genotype_index] = self.fitness_cache.get(keys[genotype_index])
+
+        uncached_indices = [i for i in range(len(genotypes)) if fitnesses[i] is None]
+        uncached_bulbs = [genotypes[i].bulbs for i in uncached_indices]
+
+        if self.evaluation_pool:
+            uncached_fitnesses = [result[0] for result in self.evaluation_pool.evaluate(uncached_bulbs)]
+        elif self.batch_evaluator:
+            uncached_fitnesses = [int(f) for f in self.batch_evaluator.evaluate(self.batch_evaluator.get_bulb_matrix(uncached_bulbs))[0]]
+        else:
+            uncached_fitnesses = [self.phenotype.evaluate_bulbs(bulbs)[0] for bulbs in uncached_bulbs]
+
+        for genotype_index, fitness in zip(uncached_indices, uncached_fitnesses):
+            fitnesses[genotype_index] = fitness
+
+            if self.fitness_cache:
+                self.fitness_cache.put(keys[genotype_index], fitness)
+
+        return fitnesses
+
+
+    def perform_run(self):
+        """Performs a single run of the EA on the current puzzle and population, logging its progress.
+
+        The run ends when decide_termination() returns True. If a checkpoint is set, it is written
+        every checkpoint_interval generations. A run restored from a checkpoint continues from there.
+        If enable_profiling is set, the run's profiling metrics are written to the log at its end
+        (covering only the part after the restore for a restored run).
+        """
+        if self.profiler is not None:
+            self.profiler.start_run(self.phenotype, self.eval_count)
+
+        if not self.run_started:
+            self.log.write_run_header(self.run_count)
+
+            if self.profiler is not None:
+                self.profiler.time_operator('evaluate', self.evaluate, self.population)
+            else:
+                self.evaluate(self.population)
+
+            self.run_started = True
+
+        while not self.perform_generation():
+            if self.checkpoint is not None and self.generation_count % self.settings.checkpoint_interval == 0:
+                self.checkpoint.write(self.get_checkpoint_state())
+
+        if self.solver:
+            self.log.write_metrics([('solver_num_lit', self.solver.best_num_lit), ('solver_optimal', int(self.solver.optimal)), ('solver_num_nodes', self.solver.num_nodes), ('solver_seconds', '%.6f' % self.solver.seconds)])
+
+        if self.fitness_cache:
+            self.log.write_metrics([('fitness_cache_hits', self.fitness_cache.hits), ('fitness_cache_misses', self.fitness_cache.misses)])
+
+        if self.profiler is not None:
+            self.log.write_metrics(self.profiler.finish_run(str(self.run_count), self.phenotype, self.eval_count))
+
+
+    def perform_generation(self, log_run=True):
+        """Breeds, mutates and evaluates one generation of children and selects the survivors.
+
+        If log_run is True, the state of the experiment is written to the log file.
+        Returns the result of decide_termination().
+        """
+        if self.profiler is not None:
+            # Same as below, adding up the time spent in each operator
+            self.profiler.time_operator('select_parents', self.select_parents)
+            self.profiler.time_operator('recombine', self.recombine)
+            self.profiler.time_operator('mutate', self.mutate)
+            self.profiler.time_operator('evaluate', self.evaluate, self.children, log_run)
+            self.profiler.time_operator('select_for_survival', self.select_for_survival)
+
+        else:
+            self.select_parents()
+
+            self.recombine()
+
+            self.mutate()
+
+            self.evaluate(self.children, log_run)
+
+            self.select_for_survival()
+
+        self.generation_count += 1
+
+        return self.decide_termination()
+
+
+    def get_checkpoint_state(self):
+        """Returns a dictionary of the state of the experiment in the middle of a run, from which
+        restore_checkpoint_state() continues it exactly: the config, seed and run count, the board,
+        the population and best genotypes as (bulb mask, fitness, fitness ratio) triples, the run's
+        counters and averages, the random number streams used during a run, the fitness cache, the
+        solver's results and the position of the log (see Log's get_resume_state()).
+
+        Set genotypes (use_bitboard_genotype of 0) are restored with the same bulbs, but not
+        necessarily in the same iteration order, so only bitboard runs are guaranteed to continue
+        exactly as they would have.
+        """
+        if self.checkpoint_board is None:
+            self.checkpoint_board = corpus_class.Corpus.encode_board(self.phenotype)
+
+        def get_compact_genotype(genotype):
+            """Returns genotype as a (bulb mask, fitness, fitness ratio) triple."""
+            return self.phenotype.get_bulb_mask(genotype.bulbs), genotype.fitness, genotype.fitness_ratio
+
+        if self.best_fit_global_genotype is self.best_fit_local_genotype:
+            best_fit_global_genotype = None
+        else:
+            # The global best comes from an earlier run (with another puzzle), so only its fitness is needed
+            best_fit_global_genotype = (self.best_fit_global_genotype.fitness, self.best_fit_global_genotype.fitness_ratio)
+
+        if self.solver:
+            solver_results = (self.solver.best_bulb_mask, self.solver.best_num_lit, self.solver.optimal, self.solver.num_nodes, self.solver.seconds)
+        else:
+            solver_results = None
+
+        return {
+            'settings': dict(self.config.settings),
+            'seed': self.seed.val,
+            'run_count': self.run_count,
+            'next_run_index': self.next_run_index,
+            'board': self.checkpoint_board,
+            'population': [get_compact_genotype(genotype) for genotype in self.population],
+            'best_fit_local_genotype': get_compact_genotype(self.best_fit_local_genotype),
+            'best_fit_global_genotype': best_fit_global_genotype,
+            'max_run_fitness': self.max_run_fitness,
+            'eval_count': self.eval_count,
+            'generation_count': self.generation_count,
+            'avg_fitness_ratio': self.avg_fitness_ratio,
+            'total_fitnesses_seen': self.total_fitnesses_seen,
+            'total_fitness_ratio_sum': self.total_fitness_ratio_sum,
+            'stale_fitness_count': self.stale_fitness_count,
+            'prev_avg_fitness_ratio': self.prev_avg_fitness_ratio,
+            'operator_random': self.operator_random,
+            'selector': self.selector,
+            'fitness_cache': self.fitness_cache,
+            'solver_results': solver_results,
+            'log': self.log.get_resume_state()
+        }
+
+
+    def restore_checkpoint_state(self, state):
+        """Restores the run state of state, a dictionary from get_checkpoint_state(), on top of a run
+        initialized with the checkpoint's puzzle (see init_run_variables()).
+        """
+
+        def get_genotype(compact_genotype):
+            """Returns a new genotype from a (bulb mask, fitness, fitness ratio) triple."""
+            bulb_mask, fitness, fitness_ratio = compact_genotype
+
+            genotype = genotype_class.Genotype(self.phenotype.create_bulbs(bulb_mask))
+            genotype.fitness = fitness
+            genotype.fitness_ratio = fitness_ratio
+
+            return genotype
+
+        self.checkpoint_board = state['board']
+        self.next_run_index = state['next_run_index']
+
+        self.population = [get_genotype(compact_genotype) for compact_genotype in state['population']]
+        self.best_fit_local_genotype = get_genotype(state['best_fit_local_genotype'])
+
+        if state['best_fit_global_genotype'] is None:
+            self.best_fit_global_genotype = self.best_fit_local_genotype
+        else:
+            self.best_fit_global_genotype = genotype_class.Genotype()
+            self.best_fit_global_genotype.fitness, self.best_fit_global_genotype.fitness_ratio = state['best_fit_global_genotype']
+
+        self.max_run_fitness = state['max_run_fitness']
+        self.eval_count = state['eval_count']
+        self.generation_count = state['generation_count']
+        self.avg_fitness_ratio = state['avg_fitness_ratio']
+        self.total_fitnesses_seen = state['total_fitnesses_seen']
+        self.total_fitness_ratio_sum = state['total_fitness_ratio_sum']
+        self.stale_fitness_count = state['stale_fitness_count']
+        self.prev_avg_fitness_ratio = state['prev_avg_fitness_ratio']
+        self.run_started = True
+
+        self.operator_random = state['operator_random']
+        self.selector = state['selector']
+        self.fitness_cache = state['fitness_cache']
+
+        if state['solver_results'] is not None:
+            # The solver already ran, so only its results are restored
+            self.solver = solver_class.Solver(self.phenotype, self.settings.solver_max_nodes, self.settings.solver_max_seconds)
+            self.solver.best_bulb_mask, self.solver.best_num_lit, self.solver.optimal, self.solver.num_nodes, self.solver.seconds = state['solver_results']
+        else:
+            self.solver = None
+
+
+    def get_migrants(self, num_migrants):
+        """Returns a list of (bulb mask, fitness) pairs of the num_migrants fittest genotypes in the population.
+
+        This is the compact form in which genotypes are sent between island populations (see IslandPool).
+        """
+        return [(self.phenotype.get_bulb_mask(genotype.bulbs), genotype.fitness) for genotype in sorted(self.population, key=lambda x : x.fitness_ratio, reverse=True)[:num_migrants]]
+
+
+    def receive_migrants(self, migrants):
+        """Replaces the least fit genotypes in the population with migrants, a list of (bulb mask, fitness)
+        pairs from get_migrants() of a population evolving on the same puzzle.
+
+        Migrants keep the fitness they were sent with, so they do not count as evaluations.
+        """
+        self.sort_genotypes(self.population)
+
+        for migrant_index, (bulb_mask, fitness) in enumerate(migrants[:len(self.population)]):
+            genotype = genotype_class.Genotype(self.phenotype.create_bulbs(bulb_mask))
+            genotype.fitness = fitness
+            genotype.fitness_ratio = fitness / (self.phenotype.num_rows * self.phenotype.num_cols - len(self.phenotype.black_squares))
+
+            self.population[len(self.population) - 1 - migrant_index] = genotype
+
+
     def select_parents(self):
         """Chooses which parents from the population will breed.
 
@@ -148,20 +491,13 @@ class EADriver:
 
         The resulting parents are stored in self.parents.
         """
-        self.parents = []
-
-        if int(self.config.settings['use_fitness_proportional_selection']):
+        if self.settings.use_fitness_proportional_selection:
             # Select parents for breeding using the fitness proportional "roulette wheel" method (with replacement)
-            self.parents = random.choices(self.population, weights=[(g.fitness_ratio * 100) / float(len(self.population)) for g in self.population], k=int(self.config.settings['parent_population_size']))
+            self.parents = self.selector.select_fitness_proportional(self.population, self.settings.parent_population_size)
 
         else:
-            # Perform a k-tournament selection with replacement
-            while len(self.parents) <= int(self.config.settings['parent_population_size']):
-                self.parents.append(self.perform_tournament_selection(self.population, int(self.config.settings['k_parent_selection']), w_replacement=True))
-            
-            # Maintain the parent population size
-            # This accounts for situations where the parent population size is not divisible by k
-            self.parents = self.parents[:int(self.config.settings['parent_population_size'])]
+            # Perform k-tournament selections with replacement
+            self.parents = self.selector.select_with_replacement(self.population, self.settings.k_parent_selection, self.settings.parent_population_size)
 
 
     def recombine(self):
@@ -170,17 +506,67 @@ class EADriver:
         The resulting children are stored in self.children.
         """
 
+        def breed_bitboards(parent_a, parent_b):
+            """Breeds two parent genotypes with Bitboard bulbs together to produce a child
+            genotype using n-point crossover over the board's cell indices.
+
+            Returns the child genotype.
+            """
+            num_cells = self.phenotype.num_rows * self.phenotype.num_cols
+
+            # Perform a n-point crossover on the parent's bitboards
+            n = self.settings.n_point_crossover
+
+            crossover_indices = sorted(self.operator_random.randint(0, num_cells) for _ in range(n))
+
+            # Ensure the entire parent is copied during crossover
+            crossover_indices.append(num_cells)
+
+            child_mask = 0
+            prev_crossover_index = 0
+            for crossover_index in crossover_indices:
+                # Bitmask of the cells in [prev_crossover_index, crossover_index)
+                region_mask = ((1 << crossover_index) - 1) ^ ((1 << prev_crossover_index) - 1)
+
+                if self.operator_random.random() < self.settings.parent_selection_weight:
+                    # Choose parent_a's substring
+                    child_mask |= parent_a.bulbs.mask & region_mask
+
+                else:
+                    # Choose parent_b's substring
+                    child_mask |= parent_b.bulbs.mask & region_mask
+
+                prev_crossover_index = crossover_index
+
+            # Build the child from the parent it differs least from, so that only the differing
+            # bulbs are added or removed (keeping any tracked lighting state up to date cheaply)
+            if bin(child_mask ^ parent_a.bulbs.mask).count('1') <= bin(child_mask ^ parent_b.bulbs.mask).count('1'):
+                child_bulbs = parent_a.bulbs.copy()
+            else:
+                child_bulbs = parent_b.bulbs.copy()
+
+            child_bulbs.update(child_mask)
+
+            child = genotype_class.Genotype()
+            child.bulbs = child_bulbs
+
+            return child
+
+
         def breed(parent_a, parent_b):
             """Breeds two parent genotypes together to produce a child genotype using
             n-point crossover.
 
             Returns the child genotype.
             """
+            if isinstance(parent_a.bulbs, bitboard_class.Bitboard):
+                return breed_bitboards(parent_a, parent_b)
+
             a_bulbs = list(parent_a.bulbs)
             b_bulbs = list(parent_b.bulbs)
 
             # Perform a n-point crossover on the parent's bulbs
-            n = int(self.config.settings['n_point_crossover'])
+            n = self.settings.n_point_crossover
 
             min_crossover_index = 0
             max_crossover_index = min(len(a_bulbs) - 1, len(b_bulbs) - 1)
@@ -195,7 +581,7 @@ class EADriver:
             rand_start = min_crossover_index 
             for _ in range(n):
                 if not rand_start == max_crossover_index and rand_start < max_crossover_index:
-                    crossover_indices.append(random.randint(rand_start, max_crossover_index))
+                    crossover_indices.append(self.operator_random.randint(rand_start, max_crossover_index))
                     rand_start = crossover_indices[-1]
             
             # Ensure the entire parent is copied during crossover
@@ -204,7 +590,7 @@ class EADriver:
             child_bulbs = set([])
             prev_crossover_index = 0
             for crossover_index in crossover_indices:
-                if random.random() < float(self.config.settings['parent_selection_weight']):
+                if self.operator_random.random() < self.settings.parent_selection_weight:
                     # Choose parent_a's substring
                     for bulb in a_bulbs[prev_crossover_index:crossover_index]:
                         child_bulbs.add(bulb)
@@ -224,8 +610,8 @@ class EADriver:
         for _ in range(self.offspring_pool_size):
             # Select parents with replacement
             # Note: this implementation allows for parent_a and parent_b to be the same genotype
-            parent_a = self.parents[random.randint(0, len(self.parents) - 1)]
-            parent_b = self.parents[random.randint(0, len(self.parents) - 1)]
+            parent_a = self.parents[self.operator_random.randint(0, len(self.parents) - 1)]
+            parent_b = self.parents[self.operator_random.randint(0, len(self.parents) - 1)]
 
             # Produce a child
             self.children.append(breed(parent_a, parent_b))
@@ -240,28 +626,32 @@ class EADriver:
 
             If this cannot be done in a valid way, the child's bulb is removed.
             """
-            if len(child.bulbs):
-                rand_bulb_index = random.randint(0, len(child.bulbs) - 1)
+            # Bulbs deduced by constraint propagation are never moved
+            forced_bulb_mask = self.phenotype.forced_bulb_mask
+
+            if isinstance(child.bulbs, bitboard_class.Bitboard):
+                removable_mask = child.bulbs.mask & ~forced_bulb_mask
+
+                if removable_mask:
+                    child.bulbs.discard_index(self.operator_random.choice(list(bitboard_class.mask_indices(removable_mask))))
+
             else:
-                rand_bulb_index = 0
+                removable_bulbs = [c for c in child.bulbs if not forced_bulb_mask >> self.phenotype.get_index(c) & 1]
 
-            try:
-                child.pop(rand_bulb_index)
-            except:
-                # No bulbs available to remove
-                pass
+                if removable_bulbs:
+                    child.bulbs.discard(self.operator_random.choice(removable_bulbs))
             
             fail_count = 0
-            while fail_count < int(self.config.settings['num_bulb_placement_failures_mutation']):
-                if self.phenotype.place_bulb_randomly(child.bulbs):
+            while fail_count < self.settings.num_bulb_placement_failures_mutation:
+                if self.phenotype.place_bulb_randomly(child.bulbs, self.operator_random):
                     break
                 else:
                     fail_count += 1
             
 
         for child in self.children:
-            if random.random() < float(self.config.settings['mutation_probability']):
-                for i in range(random.randint(1, int(self.config.settings['rand_num_bulb_shuffles']))):
+            if self.operator_random.random() < self.settings.mutation_probability:
+                for i in range(self.operator_random.randint(1, self.settings.rand_num_bulb_shuffles)):
                     shuffle_bulb(child)
 
 
@@ -272,24 +662,19 @@ class EADriver:
         Depending on the survival selection configuration, one of the two following methods
         is used to select survivors:
             1. Truncation
-            2. k-tournament selection without replacement
+            2. k-tournament selection without replacement (winners are removed from later tournaments)
         """
         combined_generations = self.population + self.children
         self.population = []
 
-        if int(self.config.settings['use_truncation']):
+        if self.settings.use_truncation:
             # Use truncation for survival selection
             self.sort_genotypes(combined_generations)
             self.population = combined_generations[:self.population_size]
         
         else:
             # Use k-tournament for survival selection without replacement
-            while len(self.population) <= self.population_size:
-                self.population.append(self.perform_tournament_selection(combined_generations, int(self.config.settings['k_survival_selection']), w_replacement=False))
-
-            # Maintain the population size
-            # This accounts for situations where the population size is not divisible by k
-            self.population = self.population[:self.population_size]
+            self.population = self.selector.select_without_replacement(combined_generations, self.settings.k_survival_selection, self.population_size)
 
 
     def decide_termination(self):
@@ -299,11 +684,11 @@ class EADriver:
             1. There has been no change in fitness (average fitness) for n evaluations.
             2. The number of evaluations specified in config has been reached.
         """
-        if self.stale_fitness_count >= int(self.config.settings['n_termination_convergence_criterion']):
+        if self.stale_fitness_count >= self.settings.n_termination_convergence_criterion:
             # There has been no change in average fitness for too long
             return True
 
-        if self.eval_count >= int(self.config.settings['num_fitness_evaluations']):
+        if self.eval_count >= self.settings.num_fitness_evaluations:
             # The number of desired evaluations has been reached
             return True
 
@@ -321,27 +706,13 @@ class EADriver:
         """Increments the run count by one."""
         self.run_count += 1
 
-    
-    def perform_tournament_selection(self, genotypes, k, w_replacement=False):
-        """Performs a k-tournament selection on genotypes, a list of genotype objects.
-
-        Returns the winning genotype.
-        """
-        arena_genotypes = []
-        forbidden_indices = set([])
-
-        # Randomly select k elements from genotypes
-        for _ in range(k):
-            rand_index = random.randint(0, len(genotypes) - 1)
-
-            # Don't allow replacement (if applicable)
-            while rand_index in forbidden_indices:
-                rand_index = random.randint(0, len(genotypes) - 1)
 
-            arena_genotypes.append(genotypes[rand_index])
+    def shutdown(self):
+        """Stops the worker processes of the evaluation pool, if any.
 
-            if w_replacement == False:
-                forbidden_indices.add(rand_index)
-
-        # Make the genotypes fight, return the winner
-        return max(arena_genotypes, key=lambda x : x.fitness_ratio)
+        Must be called once the driver is no longer used, as a process does not exit while its
+        evaluation workers are alive. A later call to init_run_variables() starts new workers.
+        """
+        if self.evaluation_pool:
+            self.evaluation_pool.shutdown()
+            self.evaluation_pool = None
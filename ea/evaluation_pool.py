@@ -0,0 +1,57 @@
+import concurrent.futures
+import puzzle.bitboard as bitboard_class
+
+
+# The puzzle held by each worker process, set once by init_worker()
+worker_puzzle = None
+
+
+def init_worker(puzzle):
+    """Stores puzzle in the worker process so that it is only sent to the worker once."""
+    global worker_puzzle
+    worker_puzzle = puzzle
+
+
+def evaluate_masks(masks):
+    """Evaluates a chunk of bulb bitmasks on the worker's puzzle.
+
+    Returns a list of (fitness, num_lit, valid) tuples (see LightUpPuzzle.evaluate_bulbs()).
+    """
+    return [worker_puzzle.evaluate_bulbs(bitboard_class.Bitboard(worker_puzzle, mask)) for mask in masks]
+
+
+class EvaluationPool:
+    def __init__(self, puzzle, num_processes=None, chunk_size=64):
+        """Initializes the EvaluationPool class.
+
+        Where puzzle is the LightUpPuzzle to evaluate genotypes on, num_processes is the number
+        of worker processes (one per CPU if None) and chunk_size is the number of genotypes sent
+        to a worker at a time.
+
+        The worker processes live until shutdown() is called, each holding its own copy of puzzle.
+        """
+        self.puzzle = puzzle
+        self.chunk_size = chunk_size
+        self.executor = concurrent.futures.ProcessPoolExecutor(max_workers=num_processes, initializer=init_worker, initargs=(puzzle,))
+
+
+    def evaluate(self, bulbs_list):
+        """Evaluates every entry of bulbs_list (each a set of coordinates or a Bitboard) across the
+        worker processes.
+
+        Returns a list of (fitness, num_lit, valid) tuples in the order of bulbs_list.
+        """
+        # Genotypes are sent as bitmasks, the most compact form of their bulbs
+        masks = [self.puzzle.get_bulb_mask(bulbs) for bulbs in bulbs_list]
+        chunks = [masks[i:i + self.chunk_size] for i in range(0, len(masks), self.chunk_size)]
+
+        results = []
+        for chunk_results in self.executor.map(evaluate_masks, chunks):
+            results.extend(chunk_results)
+
+        return results
+
+
+    def shutdown(self):
+        """Stops the worker processes."""
+        self.executor.shutdown()
@@ -0,0 +1,36 @@
+import collections
+
+
+class FitnessCache:
+    def __init__(self, size):
+        """Initializes the FitnessCache class.
+
+        Where size is the maximum number of fitness values kept. When the cache is full, the
+        least recently used value is discarded.
+        """
+        self.size = size
+        self.fitnesses = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+
+    def get(self, key):
+        """Returns the fitness stored for key (a bulb bitmask), or None if there is none."""
+        fitness = self.fitnesses.get(key)
+
+        if fitness is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.fitnesses.move_to_end(key)
+
+        return fitness
+
+
+    def put(self, key, fitness):
+        """Stores the fitness of key (a bulb bitmask)."""
+        self.fitnesses[key] = fitness
+        self.fitnesses.move_to_end(key)
+
+        if len(self.fitnesses) > self.size:
+            self.fitnesses.popitem(last=False)
@@ -1,11 +1,12 @@
-import copy
-
-
 class Genotype:
     def __init__(self, bulbs=None):
-        """Initializes the Genotype class."""
-        if bulbs:
-            self.bulbs = copy.deepcopy(bulbs)
+        """Initializes the Genotype class.
+
+        Where bulbs is a set of Coordinate objects or a Bitboard. Coordinates are never modified
+        in place, so a shallow copy of bulbs is enough to keep genotypes independent.
+        """
+        if bulbs is not None:
+            self.bulbs = bulbs.copy()
         else:
             self.bulbs = set([])
 
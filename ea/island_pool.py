@@ -0,0 +1,161 @@
+import ea.ea_driver as ea_driver_class
+import multiprocessing
+import util.config as config_class
+
+
+def perform_island(config_file, phenotype, run_count, seed_val, island_index, connection):
+    """Evolves one island population on puzzle phenotype in a worker process, migrating genotypes
+    through connection, one end of a pipe to the IslandPool.
+
+    The island draws from its own random number streams, derived from seed_val (the seed of the
+    experiment), run_count and island_index (see Seed.get_random()). Every migration_interval generations, the
+    island sends a tuple of its state (done, eval count, average fitness ratio, best fitness ratio)
+    and its migrants (see EADriver.get_migrants()), then receives a list of migrants to take in, or
+    None once every island is done. An island is done when EADriver.decide_termination() is True;
+    it keeps sending its state and best genotypes until then, but takes no more migrants in.
+
+    Finally, the best fitness ratio of the island, the solution file contents of its best genotype
+    and its profiling metrics (empty unless enable_profiling is set) are sent.
+    """
+    config = config_class.Config(config_file)
+    settings = config.get_settings()
+    ea_driver = ea_driver_class.EADriver(config, run_count=run_count, buffer_output=True, phenotype=phenotype, seed_val=seed_val, stream_key=island_index)
+
+    migration_interval = settings.migration_interval
+    num_migrants = settings.num_migrants
+
+    if ea_driver.profiler is not None:
+        ea_driver.profiler.start_run(ea_driver.phenotype, ea_driver.eval_count)
+
+    ea_driver.evaluate(ea_driver.population, log_run=False)
+    done = False
+
+    while True:
+        for _ in range(migration_interval):
+            if done:
+                break
+
+            done = ea_driver.perform_generation(log_run=False)
+
+        state = (done, ea_driver.eval_count, ea_driver.avg_fitness_ratio, ea_driver.best_fit_local_genotype.fitness_ratio)
+        connection.send((state, ea_driver.get_migrants(num_migrants)))
+
+        migrants = connection.recv()
+
+        if migrants is None:
+            break
+
+        if not done:
+            ea_driver.receive_migrants(migrants)
+
+    if ea_driver.profiler is not None:
+        metrics = ea_driver.profiler.finish_run(str(run_count) + '.' + str(island_index), ea_driver.phenotype, ea_driver.eval_count)
+    else:
+        metrics = []
+
+    best_genotype = ea_driver.best_fit_local_genotype
+    connection.send((best_genotype.fitness_ratio, ea_driver.phenotype.get_soln_text(best_genotype.bulbs), metrics))
+
+    ea_driver.shutdown()
+    connection.close()
+
+
+class IslandPool:
+    def __init__(self, config_file, ea_driver):
+        """Initializes the IslandPool class.
+
+        Where config_file is the path of the experiment's configuration file and ea_driver is the
+        EADriver whose puzzle, log and seed the island runs use.
+        """
+        self.config_file = config_file
+        self.ea_driver = ea_driver
+
+        self.num_islands = ea_driver.settings.num_islands
+        self.migration_topology = ea_driver.settings.migration_topology
+
+        # Best fitness ratio of any run so far, whose solution is in the solution file
+        self.best_fitness_ratio = ea_driver.best_fit_global_genotype.fitness_ratio
+
+
+    def get_migration_targets(self, rng):
+        """Returns a list holding the index of the island each island sends its migrants to.
+
+        With a ring topology, island i always sends to island i + 1. With a random topology, the
+        islands are arranged in a new random ring, drawn with rng, at every migration.
+        """
+        order = list(range(self.num_islands))
+
+        if self.migration_topology == 'random':
+            rng.shuffle(order)
+
+        targets = [0] * self.num_islands
+
+        for position, island_index in enumerate(order):
+            targets[island_index] = order[(position + 1) % self.num_islands]
+
+        return targets
+
+
+    def perform_run(self):
+        """Performs the current run of the EA driver with num_islands island populations, each
+        evolving on the run's puzzle in its own process (see perform_island()).
+
+        After every migration, a line of run data is logged: the evaluations performed by all islands,
+        the mean of their average fitness ratios and the best fitness ratio of any island. The
+        solution of the best island is written to the solution file if it beats every earlier run.
+        """
+        ea_driver = self.ea_driver
+        rng = ea_driver.seed.get_random(ea_driver.run_count, 'migration')
+
+        connections = []
+        processes = []
+
+        for island_index in range(self.num_islands):
+            parent_connection, child_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=perform_island, args=(self.config_file, ea_driver.phenotype, ea_driver.run_count, ea_driver.seed.val, island_index, child_connection))
+            process.start()
+            child_connection.close()
+
+            connections.append(parent_connection)
+            processes.append(process)
+
+        ea_driver.log.write_run_header(ea_driver.run_count)
+
+        while True:
+            messages = [connection.recv() for connection in connections]
+            states = [state for state, _ in messages]
+
+            ea_driver.log.write_run_data(sum(state[1] for state in states), sum(state[2] for state in states) / self.num_islands, max(state[3] for state in states))
+
+            if all(state[0] for state in states):
+                for connection in connections:
+                    connection.send(None)
+
+                break
+
+            # Send the migrants of every island to its target island
+            incoming_migrants = [None] * self.num_islands
+
+            for island_index, target_index in enumerate(self.get_migration_targets(rng)):
+                incoming_migrants[target_index] = messages[island_index][1]
+
+            for connection, migrants in zip(connections, incoming_migrants):
+                connection.send(migrants)
+
+        # Collect the best genotype of every island
+        results = [connection.recv() for connection in connections]
+
+        for process in processes:
+            process.join()
+
+        # Write the profiling metrics of every island
+        for island_index, (_, _, metrics) in enumerate(results):
+            ea_driver.log.write_metrics([('island' + str(island_index) + '_' + name, value) for name, value in metrics])
+
+        fitness_ratio, soln_text = max(results, key=lambda x : x[0])[:2]
+
+        if fitness_ratio > self.best_fitness_ratio:
+            self.best_fitness_ratio = fitness_ratio
+
+            with open(ea_driver.settings.soln_file_path, 'w') as soln_file:
+                soln_file.write(soln_text)
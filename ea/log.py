@@ -1,9 +1,31 @@
+import array
+import os
+import puzzle.bitboard as bitboard_class
+import struct
+import sys
+
+
+# Start of every binary run data file and the header of each block of run data in it
+BINARY_LOG_MAGIC = b'LUPLOG1\n'
+BINARY_BLOCK_HEADER = '<iq'
+
+
 class Log:
-    def __init__(self, config, seed, puzzle, overwrite=False):
+    def __init__(self, config, seed, puzzle, overwrite=False, buffer=False, resume_state=None):
         """Initializes the Log class.
         
         Where config is a Config object and overwrite determines if the file will be
         appended to or overwritten.
+
+        Log lines and run data are kept in memory and written to file log_flush_interval records at
+        a time. Run data is written as text lines to the log file, or with a log_format of binary,
+        to a columnar binary file next to it (see get_binary_log_file_path()). Every
+        log_print_interval-th run data record is also printed to the screen.
+
+        If buffer is True, no file is opened and nothing is printed: written records are collected
+        in self.records instead, so they can be replayed into another log later (see write_records()).
+        If resume_state is given (see get_resume_state()), the log files are cut back to the point
+        it was taken at and appended to, instead of starting a new log. Call close() once logging is done.
         """
 
         def write_config_params():
@@ -23,13 +45,19 @@ class Log:
 
             special_keys = set([
                 'input_file_path',
+                'corpus_file_path',
+                'corpus_instance_id',
                 'log_file_path',
                 'soln_file_path',
                 'seed'
             ])
 
 
-            if int(self.config.settings['generate_uniform_random_puzzle']):
+            if self.config.get_settings().corpus_file_path:
+                self.write('Puzzle Source: ' + self.config.get_settings().corpus_file_path + ' (corpus instance ' + str(self.config.get_settings().corpus_instance_id) + ')')
+                self.write()
+
+            elif self.config.get_settings().generate_uniform_random_puzzle:
                 self.write('Randomly Generated Puzzle')
 
                 for key in random_puzzle_init_keys:
@@ -45,6 +73,9 @@ class Log:
             self.write('board size (#cols x #rows): ' + str(self.puzzle.num_cols) + ' x ' + str(self.puzzle.num_rows))
             self.write('seed: ' + str(self.seed.val))
 
+            if self.config.get_settings().use_constraint_propagation:
+                self.write('constraint propagation: ' + str(len(list(bitboard_class.mask_indices(self.puzzle.forced_bulb_mask)))) + ' forced bulbs, ' + str(len(self.puzzle.placement_coords)) + ' undecided squares')
+
 
             for key, val in self.config.settings.items():
                 if key not in special_keys.union(random_puzzle_init_keys):
@@ -54,30 +85,187 @@ class Log:
 
 
         self.config = config
-
-        self.file = open(self.config.settings['log_file_path'], 'w' if overwrite else 'a')
+        self.buffer = buffer
+        self.records = []
 
         self.seed = seed
         self.puzzle = puzzle
 
-        write_config_params()
-        self.write('Result Log')
+        settings = self.config.get_settings()
+
+        self.use_binary_format = settings.log_format == 'binary'
+        self.flush_interval = max(settings.log_flush_interval, 1)
+        self.print_interval = settings.log_print_interval
+        self.num_run_data_records = 0
+
+        # Records waiting to be written to file
+        self.pending_lines = []
+        self.pending_run_count = 0
+        self.pending_evals = array.array('q')
+        self.pending_average_fitnesses = array.array('d')
+        self.pending_best_fitnesses = array.array('d')
+
+        if not self.buffer and resume_state is not None:
+            # Drop anything logged after the state was taken and continue from there
+            os.truncate(settings.log_file_path, resume_state['file_position'])
+            self.file = open(settings.log_file_path, 'a')
+
+            if self.use_binary_format:
+                os.truncate(self.get_binary_log_file_path(settings.log_file_path), resume_state['binary_file_position'])
+                self.binary_file = open(self.get_binary_log_file_path(settings.log_file_path), 'ab')
+
+            self.num_run_data_records = resume_state['num_run_data_records']
+            self.pending_run_count = resume_state['run_count']
+
+        elif not self.buffer:
+            self.file = open(settings.log_file_path, 'w' if overwrite else 'a')
+
+            if self.use_binary_format:
+                self.binary_file = open(self.get_binary_log_file_path(settings.log_file_path), 'wb' if overwrite else 'ab')
+
+                if self.binary_file.tell() == 0:
+                    self.binary_file.write(BINARY_LOG_MAGIC)
+
+            write_config_params()
+            self.write('Result Log')
+
+
+    @staticmethod
+    def get_binary_log_file_path(log_file_path):
+        """Returns the path of the binary run data file belonging to the log at log_file_path."""
+        return os.path.splitext(log_file_path)[0] + '.bin'
+
 
-    
     def write(self, write_string=''):
-        """Writes the contents of write_string to file."""
-        self.file.write(write_string + '\n')
+        """Writes the contents of write_string to file (or to self.records when buffering)."""
+        if self.buffer:
+            self.records.append(('line', write_string))
+            return
+
+        self.pending_lines.append(write_string + '\n')
+
+        if len(self.pending_lines) >= self.flush_interval:
+            self.flush()
+
+
+    def write_records(self, records):
+        """Writes the records collected by a buffered log, printing any run headers among them."""
+        for record in records:
+            if record[0] == 'line':
+                self.write(record[1])
+            elif record[0] == 'run_header':
+                self.write_run_header(record[1])
+            else:
+                self.write_run_data(*record[1:])
 
 
     def write_run_header(self, run_count):
         """Writes the given run count to file and to the screen."""
+        if self.buffer:
+            self.records.append(('run_header', run_count))
+            return
+
+        # Run data is written per run in the binary format
+        self.flush()
+        self.pending_run_count = run_count
+
         run_header = '\nRun %i' % (run_count)
         self.write(run_header)
         print(run_header)
 
 
     def write_run_data(self, eval_count, average_fitness, best_fitness):
-        """Writes the given run data to file and to the screen."""
-        run_data = str(eval_count) + '\t' + str(average_fitness) + '\t' + str(best_fitness)
-        self.write(run_data)
-        print(run_data)
+        """Writes the given run data to file and, every log_print_interval records, to the screen."""
+        if self.buffer:
+            self.records.append(('run_data', eval_count, average_fitness, best_fitness))
+            return
+
+        if self.use_binary_format:
+            self.pending_evals.append(eval_count)
+            self.pending_average_fitnesses.append(average_fitness)
+            self.pending_best_fitnesses.append(best_fitness)
+
+            if len(self.pending_evals) >= self.flush_interval:
+                self.flush()
+
+        else:
+            self.write(str(eval_count) + '\t' + str(average_fitness) + '\t' + str(best_fitness))
+
+        self.num_run_data_records += 1
+
+        if self.print_interval and self.num_run_data_records % self.print_interval == 0:
+            print(str(eval_count) + '\t' + str(average_fitness) + '\t' + str(best_fitness))
+
+
+    def write_metrics(self, metrics):
+        """Writes the given list of (name, value) pairs to file and to the screen, one per line.
+
+        Metric lines start with a letter so that they are not mistaken for run data.
+        """
+        for name, value in metrics:
+            metric = name + ': ' + str(value)
+            self.write(metric)
+
+            if not self.buffer:
+                print(metric)
+
+
+    def flush(self):
+        """Writes all pending records to file.
+
+        Binary run data is written as a block: the run count and number of records (BINARY_BLOCK_HEADER)
+        followed by the evaluation counts (int64), average fitnesses (float64) and best fitnesses
+        (float64), each as a little-endian array.
+        """
+        if self.buffer:
+            return
+
+        if self.pending_lines:
+            self.file.write(''.join(self.pending_lines))
+            self.pending_lines = []
+
+        if len(self.pending_evals):
+            self.binary_file.write(struct.pack(BINARY_BLOCK_HEADER, self.pending_run_count, len(self.pending_evals)))
+
+            for column in (self.pending_evals, self.pending_average_fitnesses, self.pending_best_fitnesses):
+                if sys.byteorder == 'big':
+                    column.byteswap()
+
+                self.binary_file.write(column.tobytes())
+
+            self.pending_evals = array.array('q')
+            self.pending_average_fitnesses = array.array('d')
+            self.pending_best_fitnesses = array.array('d')
+
+        self.file.flush()
+
+        if self.use_binary_format:
+            self.binary_file.flush()
+
+
+    def get_resume_state(self):
+        """Writes all pending records, syncs the log files to disk and returns a dictionary of the
+        state needed to continue this log later (see resume_state in __init__()).
+        """
+        self.flush()
+
+        resume_state = {'file_position': self.file.tell(), 'binary_file_position': 0, 'num_run_data_records': self.num_run_data_records, 'run_count': self.pending_run_count}
+        os.fsync(self.file.fileno())
+
+        if self.use_binary_format:
+            resume_state['binary_file_position'] = self.binary_file.tell()
+            os.fsync(self.binary_file.fileno())
+
+        return resume_state
+
+
+    def close(self):
+        """Writes all pending records and closes the log files."""
+        if self.buffer:
+            return
+
+        self.flush()
+        self.file.close()
+
+        if self.use_binary_format:
+            self.binary_file.close()
@@ -0,0 +1,77 @@
+import cProfile
+import time
+
+
+# Operators of a generation, in the order their timings are written to the log
+OPERATOR_NAMES = ('select_parents', 'recombine', 'mutate', 'evaluate', 'select_for_survival')
+
+
+class Profiler:
+    def __init__(self, profile_file_path=''):
+        """Initializes the Profiler class.
+
+        Where profile_file_path is the file the cProfile statistics of each run are dumped to, with
+        the run's name appended (empty for none). Between start_run() and finish_run(), the time
+        spent in each operator called through time_operator() is added up.
+        """
+        self.profile_file_path = profile_file_path
+        self.operator_seconds = dict((name, 0.0) for name in OPERATOR_NAMES)
+        self.profile = None
+        self.start_time = 0.0
+        self.start_eval_count = 0
+        self.start_num_place_bulb_calls = 0
+        self.start_num_place_bulb_failures = 0
+
+
+    def start_run(self, phenotype, eval_count):
+        """Resets the timings for a run on phenotype (a LightUpPuzzle) that has performed eval_count
+        evaluations so far, and starts profiling it if profile_file_path is set.
+        """
+        for name in self.operator_seconds:
+            self.operator_seconds[name] = 0.0
+
+        self.start_eval_count = eval_count
+        self.start_num_place_bulb_calls = phenotype.num_place_bulb_calls
+        self.start_num_place_bulb_failures = phenotype.num_place_bulb_failures
+
+        if self.profile_file_path:
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+
+        self.start_time = time.perf_counter()
+
+
+    def time_operator(self, name, operator, *args):
+        """Calls operator with args, adding the time it takes to that of the operator called name.
+
+        Returns the result of the operator.
+        """
+        start_time = time.perf_counter()
+        result = operator(*args)
+        self.operator_seconds[name] += time.perf_counter() - start_time
+
+        return result
+
+
+    def finish_run(self, run_name, phenotype, eval_count):
+        """Stops timing the run named run_name (its number, or its number and island index for an
+        island), which ended after eval_count evaluations on phenotype, and dumps its cProfile
+        statistics to profile_file_path followed by '.' and run_name if profile_file_path is set.
+
+        Returns a list of (name, value) metrics of the run for Log.write_metrics(): the seconds spent
+        in each operator, the place_bulb() calls and failures of random bulb placements and the
+        evaluations per second.
+        """
+        run_seconds = time.perf_counter() - self.start_time
+
+        if self.profile is not None:
+            self.profile.disable()
+            self.profile.dump_stats(self.profile_file_path + '.' + run_name)
+            self.profile = None
+
+        metrics = [('profile_' + name + '_seconds', '%.6f' % self.operator_seconds[name]) for name in OPERATOR_NAMES]
+        metrics.append(('profile_place_bulb_calls', phenotype.num_place_bulb_calls - self.start_num_place_bulb_calls))
+        metrics.append(('profile_place_bulb_failures', phenotype.num_place_bulb_failures - self.start_num_place_bulb_failures))
+        metrics.append(('profile_evals_per_second', '%.1f' % ((eval_count - self.start_eval_count) / run_seconds if run_seconds > 0 else 0.0)))
+
+        return metrics
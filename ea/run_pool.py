@@ -0,0 +1,68 @@
+import concurrent.futures
+import ea.ea_driver as ea_driver_class
+import util.config as config_class
+
+
+def perform_run(config_file, run_count, seed_val):
+    """Performs run number run_count of the experiment described by config_file in a worker process.
+
+    The run draws from the random number streams of run run_count derived from seed_val, the seed of
+    the experiment, so it is the same run as in a sequential experiment (see Seed.get_random()).
+    Returns a tuple of the run's buffered log records, its best fitness ratio and the solution file
+    contents of its best genotype.
+    """
+    config = config_class.Config(config_file)
+    ea_driver = ea_driver_class.EADriver(config, run_count=run_count, buffer_output=True, seed_val=seed_val)
+
+    ea_driver.perform_run()
+    ea_driver.shutdown()
+
+    best_genotype = ea_driver.best_fit_local_genotype
+
+    return ea_driver.log.records, best_genotype.fitness_ratio, ea_driver.phenotype.get_soln_text(best_genotype.bulbs)
+
+
+class RunPool:
+    def __init__(self, config_file, ea_driver):
+        """Initializes the RunPool class.
+
+        Where config_file is the path of the experiment's configuration file and ea_driver is the
+        EADriver whose log and seed the parallel runs report to.
+        """
+        self.config_file = config_file
+        self.ea_driver = ea_driver
+
+
+    def perform_runs(self, num_processes=None):
+        """Performs all num_experiment_runs runs across num_processes worker processes (one per CPU
+        if num_processes is None).
+
+        Each run's log records are merged into the log in run order, and the solution of the best run
+        (the earliest one on ties, as in a sequential experiment) is written to the solution file.
+        """
+        settings = self.ea_driver.settings
+        num_runs = settings.num_experiment_runs
+        best_fitness_ratio = self.ea_driver.best_fit_global_genotype.fitness_ratio
+        best_soln_text = None
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=num_processes) as executor:
+            futures = []
+
+            for run_count in range(self.ea_driver.run_count, num_runs + 1):
+                futures.append(executor.submit(perform_run, self.config_file, run_count, self.ea_driver.seed.val))
+
+            # Merge the results in run order
+            for future in futures:
+                log_records, fitness_ratio, soln_text = future.result()
+
+                self.ea_driver.log.write_records(log_records)
+
+                if fitness_ratio > best_fitness_ratio:
+                    best_fitness_ratio = fitness_ratio
+                    best_soln_text = soln_text
+
+                self.ea_driver.increment_run_count()
+
+        if best_soln_text is not None:
+            with open(settings.soln_file_path, 'w') as soln_file:
+                soln_file.write(best_soln_text)
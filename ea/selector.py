@@ -0,0 +1,98 @@
+import math
+import numpy as np
+
+
+class Selector:
+    def __init__(self, seed):
+        """Initializes the Selector class.
+
+        Where seed is the integer seed of the NumPy random generator the selector draws from.
+
+        Tournaments are decided by rank rather than by drawing k contestants: the genotypes are
+        sorted by fitness once, and the winner of a tournament is the contestant with the best
+        rank, whose distribution is known in closed form. A tournament therefore costs the same
+        for any k.
+        """
+        self.rng = np.random.default_rng(seed)
+
+
+    def get_fitness_ranking(self, genotypes):
+        """Returns an array of the indices of genotypes, a list of genotype objects, from most fit to
+        least fit. Ties, which are common since fitness counts lit squares, are broken randomly, so
+        that tied genotypes are selected equally often wherever they are in genotypes.
+        """
+        fitness_ratios = np.fromiter((genotype.fitness_ratio for genotype in genotypes), dtype=np.float64, count=len(genotypes))
+
+        return np.lexsort((self.rng.random(len(fitness_ratios)), -fitness_ratios))
+
+
+    def select_with_replacement(self, genotypes, k, num_winners):
+        """Performs num_winners k-tournaments with replacement on genotypes, a list of genotype objects.
+
+        Returns the list of winning genotypes.
+
+        The best rank among k contestants drawn uniformly with replacement from m genotypes is at
+        least r with probability ((m - r) / m) ** k, so it is sampled by inverting that function.
+        """
+        ranking = self.get_fitness_ranking(genotypes)
+        num_genotypes = len(genotypes)
+
+        # 1 - random() lies in (0, 1], so every rank is below num_genotypes
+        uniforms = 1.0 - self.rng.random(num_winners)
+        ranks = np.minimum((num_genotypes * (1.0 - uniforms ** (1.0 / k))).astype(np.int64), num_genotypes - 1)
+
+        return [genotypes[index] for index in ranking[ranks]]
+
+
+    def select_without_replacement(self, genotypes, k, num_winners):
+        """Performs num_winners k-tournaments on genotypes, a list of genotype objects. The contestants
+        of a tournament are distinct and every winner is removed from later tournaments, so no
+        genotype is selected twice (k is reduced when fewer than k genotypes remain).
+
+        Returns the list of winning genotypes.
+
+        The best rank among k distinct contestants drawn from m genotypes is at least r with
+        probability C(m - r, k) / C(m, k), which is inverted by bisection over the remaining ranks.
+        """
+        remaining = self.get_fitness_ranking(genotypes).tolist()
+        uniforms = 1.0 - self.rng.random(num_winners)
+        winners = []
+
+        for uniform in uniforms[:len(remaining)]:
+            num_remaining = len(remaining)
+            num_contestants = min(k, num_remaining)
+
+            log_uniform = math.log(uniform)
+            log_num_draws = math.lgamma(num_remaining + 1) - math.lgamma(num_remaining - num_contestants + 1)
+
+            # Find the largest rank r with C(m - r, k) / C(m, k) >= uniform
+            low = 0
+            high = num_remaining - num_contestants
+
+            while low < high:
+                rank = (low + high + 1) // 2
+
+                if math.lgamma(num_remaining - rank + 1) - math.lgamma(num_remaining - rank - num_contestants + 1) - log_num_draws >= log_uniform:
+                    low = rank
+                else:
+                    high = rank - 1
+
+            winners.append(genotypes[remaining.pop(low)])
+
+        return winners
+
+
+    def select_fitness_proportional(self, genotypes, num_winners):
+        """Selects num_winners genotypes from genotypes, a list of genotype objects, with replacement and
+        with probability proportional to their fitness ("roulette wheel" selection).
+
+        Returns the list of selected genotypes. If no genotype has any fitness, they are selected uniformly.
+        """
+        cum_fitness_ratios = np.cumsum(np.fromiter((genotype.fitness_ratio for genotype in genotypes), dtype=np.float64, count=len(genotypes)))
+
+        if cum_fitness_ratios[-1] > 0:
+            indices = np.searchsorted(cum_fitness_ratios, self.rng.random(num_winners) * cum_fitness_ratios[-1], side='right')
+        else:
+            indices = self.rng.integers(0, len(genotypes), num_winners)
+
+        return [genotypes[index] for index in indices]
@@ -0,0 +1,133 @@
+import concurrent.futures
+import configparser
+import ea.ea_driver as ea_driver_class
+import itertools
+import json
+import os
+import random
+import sqlite3
+import time
+import util.config as config_class
+
+
+def perform_sweep_run(base_config_file_path, overrides, run_count, sweep_seed, cell_id):
+    """Performs run number run_count of the cell cell_id with the config at base_config_file_path,
+    where each key of the dictionary overrides replaces the config value, in a worker process.
+
+    The run's random number streams are derived from sweep_seed, with cell_id as their stream key
+    (see Seed.get_random()), so every cell evolves on the same puzzle in a given run.
+    Returns a tuple of the run's best fitness ratio, final average fitness ratio, number of
+    evaluations and wall time in seconds.
+    """
+    config = config_class.Config(base_config_file_path)
+
+    for key, value in overrides.items():
+        config.set(key, value)
+
+    # Sweep results are kept in the results store only
+    config.set('log_file_path', os.devnull)
+    config.set('soln_file_path', os.devnull)
+
+    start_time = time.perf_counter()
+
+    ea_driver = ea_driver_class.EADriver(config, run_count=run_count, buffer_output=True, seed_val=sweep_seed, stream_key=cell_id)
+    ea_driver.perform_run()
+    ea_driver.shutdown()
+
+    return ea_driver.best_fit_local_genotype.fitness_ratio, ea_driver.avg_fitness_ratio, ea_driver.eval_count, time.perf_counter() - start_time
+
+
+class Sweep:
+    def __init__(self, sweep_file_path):
+        """Initializes the Sweep class.
+
+        Where sweep_file_path is a CFG file with a [sweep] section (see config/sweep.cfg) and a
+        [parameters] section mapping config keys to comma separated lists of values to try.
+        """
+        sweep_file = configparser.ConfigParser()
+        sweep_file.optionxform = str
+        sweep_file.read(sweep_file_path)
+
+        self.settings = sweep_file['sweep']
+        self.parameters = dict((key, [v.strip() for v in values.split(',')]) for key, values in sweep_file['parameters'].items())
+
+        self.base_config_file_path = self.settings['base_config_file_path']
+        self.results_file_path = self.settings['results_file_path']
+        self.seed = self.settings['seed']
+
+        base_config = config_class.Config(self.base_config_file_path)
+        self.num_runs = int(self.settings.get('num_runs', base_config.settings['num_experiment_runs']))
+
+
+    def get_cells(self):
+        """Returns the list of parameter combinations (cells) to run, each a dictionary of overrides.
+
+        With a sampling of grid, every combination is returned. With a sampling of random,
+        num_random_samples distinct combinations are drawn (the same ones every time for a given seed).
+        """
+        keys = sorted(self.parameters)
+        cells = [dict(zip(keys, values)) for values in itertools.product(*[self.parameters[key] for key in keys])]
+
+        if self.settings['sampling'] == 'random':
+            num_samples = min(int(self.settings['num_random_samples']), len(cells))
+            cells = random.Random(self.seed).sample(cells, num_samples)
+
+        return cells
+
+
+    def get_cell_id(self, cell):
+        """Returns the canonical string identifying cell in the results store."""
+        return ';'.join(key + '=' + cell[key] for key in sorted(cell))
+
+
+    def open_results(self):
+        """Opens (creating if needed) the results store, an SQLite database indexed by cell and run."""
+        results = sqlite3.connect(self.results_file_path)
+        results.execute('CREATE TABLE IF NOT EXISTS results (cell_id TEXT, run INTEGER, parameters TEXT, best_fitness REAL, average_fitness REAL, num_evals INTEGER, seconds REAL, PRIMARY KEY (cell_id, run))')
+
+        return results
+
+
+    def perform(self, num_processes=None):
+        """Performs every (cell, run) pair that is not already in the results store across
+        num_processes worker processes (one per CPU if None).
+
+        Each result is committed as soon as it arrives, so an interrupted sweep resumes where it stopped.
+        """
+        results = self.open_results()
+        completed = set(results.execute('SELECT cell_id, run FROM results'))
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=num_processes) as executor:
+            futures = {}
+
+            for cell in self.get_cells():
+                cell_id = self.get_cell_id(cell)
+
+                for run_count in range(1, self.num_runs + 1):
+                    if (cell_id, run_count) not in completed:
+                        future = executor.submit(perform_sweep_run, self.base_config_file_path, cell, run_count, self.seed, cell_id)
+                        futures[future] = (cell_id, cell, run_count)
+
+            print('%i runs to perform (%i already done)' % (len(futures), len(completed)))
+
+            for future in concurrent.futures.as_completed(futures):
+                cell_id, cell, run_count = futures[future]
+                best_fitness, average_fitness, num_evals, seconds = future.result()
+
+                results.execute('INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?)', (cell_id, run_count, json.dumps(cell, sort_keys=True), best_fitness, average_fitness, num_evals, seconds))
+                results.commit()
+
+                print('%s run %i: best fitness %f (%i evals, %.2f s)' % (cell_id, run_count, best_fitness, num_evals, seconds))
+
+        results.close()
+
+
+    def get_summary(self):
+        """Returns a list of (cell id, number of runs, mean best fitness, mean evaluations) tuples for
+        every cell in the results store, best mean fitness first.
+        """
+        results = self.open_results()
+        summary = list(results.execute('SELECT cell_id, COUNT(*), AVG(best_fitness), AVG(num_evals) FROM results GROUP BY cell_id ORDER BY AVG(best_fitness) DESC'))
+        results.close()
+
+        return summary
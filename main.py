@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 
+import ea.checkpoint as checkpoint_class
 import ea.ea_driver as ea_driver_class
+import ea.island_pool as island_pool_class
+import ea.run_pool as run_pool_class
 import util.args as args_class
 import util.config as config_class
 
@@ -14,31 +17,52 @@ if __name__ == '__main__':
 
     # Setup configuration
     config = config_class.Config(config_file)
+    settings = config.get_settings()
+
+
+    # Resume from the checkpoint, if any, when the experiment runs in this process
+    num_processes = settings.num_experiment_processes
+
+    if settings.checkpoint_file_path and settings.num_islands == 1 and num_processes == 1:
+        checkpoint = checkpoint_class.Checkpoint(settings.checkpoint_file_path)
+    else:
+        checkpoint = None
 
 
     # Initialize the EA driver and its run variables
-    ea_driver = ea_driver_class.EADriver(config)
+    ea_driver = ea_driver_class.EADriver(config, checkpoint=checkpoint)
 
 
     # Run the EA
-    while ea_driver.run_count <= int(config.settings["num_experiment_runs"]):
+    if settings.num_islands > 1:
+        # Perform the runs in sequence, evolving island populations in parallel within each run
+        island_pool = island_pool_class.IslandPool(config_file, ea_driver)
+
+        while ea_driver.run_count <= settings.num_experiment_runs:
+
+            island_pool.perform_run()
+
+            ea_driver.init_run_variables()
+            ea_driver.increment_run_count()
 
-        ea_driver.log.write_run_header(ea_driver.run_count)
-        ea_driver.evaluate(ea_driver.population)
+    elif num_processes == 1:
+        while ea_driver.run_count <= settings.num_experiment_runs:
 
-        while True:
-            ea_driver.select_parents()
+            ea_driver.perform_run()
 
-            ea_driver.recombine()
+            ea_driver.init_run_variables()
+            ea_driver.increment_run_count()
 
-            ea_driver.mutate()
+    else:
+        # Perform independent runs in worker processes (num_processes of 0 uses every CPU)
+        run_pool = run_pool_class.RunPool(config_file, ea_driver)
+        run_pool.perform_runs(num_processes if num_processes > 1 else None)
 
-            ea_driver.evaluate(ea_driver.children)
 
-            ea_driver.select_for_survival()
+    # Stop the evaluation workers and write any log records still held in memory
+    ea_driver.shutdown()
+    ea_driver.log.close()
 
-            if ea_driver.decide_termination():
-                break
-            
-        ea_driver.init_run_variables()
-        ea_driver.increment_run_count()
+    # The experiment is complete, so there is nothing left to resume
+    if checkpoint is not None:
+        checkpoint.remove()
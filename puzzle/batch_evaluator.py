@@ -0,0 +1,96 @@
+import numpy as np
+import puzzle.bitboard as bitboard_class
+
+
+class BatchEvaluator:
+    def __init__(self, puzzle):
+        """Initializes the BatchEvaluator class.
+
+        Where puzzle is a LightUpPuzzle. The puzzle's row and column segments and the neighbours of
+        its numbered black squares are converted to index tables once, so that a whole population
+        can be evaluated with a handful of NumPy operations.
+        """
+        self.puzzle = puzzle
+        self.num_cells = puzzle.num_rows * puzzle.num_cols
+        self.num_white_cells = self.num_cells - len(puzzle.black_squares)
+
+        self.row_segment_ids = np.array(puzzle.row_segment_ids, dtype=np.int64)
+        self.col_segment_ids = np.array(puzzle.col_segment_ids, dtype=np.int64)
+        self.num_row_segments = len(puzzle.row_segments)
+        self.num_col_segments = len(puzzle.col_segments)
+
+        self.white_indices = np.flatnonzero(self.row_segment_ids >= 0)
+        self.enforce_adj_quotas = puzzle.settings.enforce_adj_quotas
+
+        # Table of the neighbouring cells of each black square with an adjacency quota
+        # Missing neighbours point at an extra, always empty, column (index self.num_cells)
+        adj_value_dont_care = puzzle.settings.adj_value_dont_care
+        quota_squares = [(coord, value) for coord, value in sorted(puzzle.black_squares.items()) if value < adj_value_dont_care]
+
+        self.quota_values = np.array([value for _, value in quota_squares], dtype=np.int64)
+        self.quota_neighbours = np.full((len(quota_squares), 4), self.num_cells, dtype=np.int64)
+
+        for square_index, (coord, _) in enumerate(quota_squares):
+            for neighbour_index, adj_coord in enumerate(puzzle.get_adj_coords(coord)):
+                self.quota_neighbours[square_index, neighbour_index] = puzzle.get_index(adj_coord)
+
+
+    def get_bulb_matrix(self, bulbs_list):
+        """Returns a 2D boolean array with one row per entry of bulbs_list (each a set of coordinates
+        or a Bitboard) and one column per cell index.
+        """
+        bulb_matrix = np.zeros((len(bulbs_list), self.num_cells), dtype=bool)
+        num_bytes = (self.num_cells + 7) // 8
+
+        for row, bulbs in enumerate(bulbs_list):
+            if isinstance(bulbs, bitboard_class.Bitboard):
+                mask_bytes = np.frombuffer(bulbs.mask.to_bytes(num_bytes, 'little'), dtype=np.uint8)
+                bulb_matrix[row] = np.unpackbits(mask_bytes, bitorder='little')[:self.num_cells]
+
+            else:
+                bulb_matrix[row, [self.puzzle.get_index(coord) for coord in bulbs]] = True
+
+        return bulb_matrix
+
+
+    def get_bulb_mask(self, bulb_row):
+        """Returns the integer bitmask of the bulbs in bulb_row, a row of a bulb matrix (see get_bulb_matrix())."""
+        return int.from_bytes(np.packbits(bulb_row, bitorder='little').tobytes(), 'little')
+
+
+    def evaluate(self, bulb_matrix):
+        """Evaluates every row of bulb_matrix (see get_bulb_matrix()) at once.
+
+        Returns a tuple of four arrays with one entry per row:
+        1. fitness: the number of lit white squares (0 for invalid rows, as in check_valid_solution())
+        2. fitness_ratio: fitness divided by the number of white squares
+        3. valid: True if no bulbs shine on eachother and, if enforced, every quota is met
+        4. quota_violations: the number of numbered black squares with the wrong number of adjacent bulbs
+        """
+        num_rows = bulb_matrix.shape[0]
+        row_ids, cell_indices = np.nonzero(bulb_matrix)
+
+        # Count the bulbs in every segment of every row
+        row_segment_counts = np.bincount(row_ids * self.num_row_segments + self.row_segment_ids[cell_indices], minlength=num_rows * self.num_row_segments).reshape(num_rows, self.num_row_segments)
+        col_segment_counts = np.bincount(row_ids * self.num_col_segments + self.col_segment_ids[cell_indices], minlength=num_rows * self.num_col_segments).reshape(num_rows, self.num_col_segments)
+
+        # Bulbs shine on eachother exactly when a segment holds more than one bulb
+        valid = (row_segment_counts <= 1).all(axis=1) & (col_segment_counts <= 1).all(axis=1)
+
+        # A white square is lit when its row or column segment holds a bulb
+        white_row_ids = self.row_segment_ids[self.white_indices]
+        white_col_ids = self.col_segment_ids[self.white_indices]
+        lit = (row_segment_counts[:, white_row_ids] > 0) | (col_segment_counts[:, white_col_ids] > 0)
+        num_lit = lit.sum(axis=1)
+
+        # Count the bulbs next to each numbered black square
+        padded_matrix = np.concatenate((bulb_matrix, np.zeros((num_rows, 1), dtype=bool)), axis=1)
+        adj_bulb_counts = padded_matrix[:, self.quota_neighbours].sum(axis=2)
+        quota_violations = (adj_bulb_counts != self.quota_values).sum(axis=1)
+
+        if self.enforce_adj_quotas:
+            valid &= quota_violations == 0
+
+        fitness = np.where(valid, num_lit, 0)
+
+        return fitness, fitness / self.num_white_cells, valid, quota_violations
@@ -0,0 +1,79 @@
+import numpy as np
+import puzzle.bitboard as bitboard_class
+
+
+class BatchSampler:
+    def __init__(self, puzzle):
+        """Initializes the BatchSampler class.
+
+        Where puzzle is a LightUpPuzzle. Two bulbs conflict exactly when they share a row or column
+        segment, so the segments are converted to padded index tables once (missing entries point at
+        an extra, never selectable, column with index self.num_cells).
+        """
+        self.puzzle = puzzle
+        self.num_cells = puzzle.num_rows * puzzle.num_cols
+
+        self.row_segment_ids = np.array(puzzle.row_segment_ids, dtype=np.int64)
+        self.col_segment_ids = np.array(puzzle.col_segment_ids, dtype=np.int64)
+
+        self.row_segment_table = self.get_segment_table(puzzle.row_segments)
+        self.col_segment_table = self.get_segment_table(puzzle.col_segments)
+
+        # Squares a bulb may be placed on: white squares that are not forbidden (see place_bulb())
+        # and not lit by the bulbs every container starts with (see create_bulbs())
+        self.forced_bulbs = np.zeros(self.num_cells, dtype=bool)
+        forced_lit_mask = 0
+
+        for index in bitboard_class.mask_indices(puzzle.forced_bulb_mask):
+            self.forced_bulbs[index] = True
+            forced_lit_mask |= puzzle.shine_masks[index]
+
+        self.candidates = np.frombuffer(bytes(puzzle.bulb_forbidden), dtype=np.uint8) == 0
+
+        for index in bitboard_class.mask_indices(forced_lit_mask):
+            self.candidates[index] = False
+
+
+    def get_segment_table(self, segments):
+        """Returns a 2D array with one row of cell indices per segment, padded with self.num_cells."""
+        segment_table = np.full((max(len(segments), 1), max([len(segment) for segment in segments] + [1])), self.num_cells, dtype=np.int64)
+
+        for segment_id, segment in enumerate(segments):
+            segment_table[segment_id, :len(segment)] = segment
+
+        return segment_table
+
+
+    def sample(self, num_samples, rng):
+        """Returns a 2D boolean bulb matrix (see BatchEvaluator.get_bulb_matrix()) holding num_samples
+        random maximal bulb placements, drawn with rng, a NumPy Generator.
+
+        Every placement is valid apart from the adjacency quotas, and no further bulb could be added
+        to it. Each sample is built by giving every candidate square a random priority and placing
+        bulbs on the squares with the lowest priority in both of their segments, repeatedly, until
+        every candidate is lit. This equals placing bulbs greedily in a uniformly random order.
+        """
+        priorities = rng.random((num_samples, self.num_cells + 1))
+        priorities[:, np.append(~self.candidates, True)] = np.inf
+
+        bulbs = np.zeros((num_samples, self.num_cells + 1), dtype=bool)
+        bulbs[:, :self.num_cells] = self.forced_bulbs
+
+        cell_priorities = priorities[:, :self.num_cells]
+
+        while np.isfinite(cell_priorities).any():
+            # The lowest priority candidate of each segment
+            row_segment_mins = priorities[:, self.row_segment_table].min(axis=2)
+            col_segment_mins = priorities[:, self.col_segment_table].min(axis=2)
+
+            # Squares that are the lowest priority candidate of both their segments shine on no other
+            # selected square, and the lowest priority candidate of the whole board is always one of them
+            selected = np.zeros((num_samples, self.num_cells + 1), dtype=bool)
+            selected[:, :self.num_cells] = np.isfinite(cell_priorities) & (cell_priorities == row_segment_mins[:, self.row_segment_ids]) & (cell_priorities == col_segment_mins[:, self.col_segment_ids])
+            bulbs |= selected
+
+            # Squares lit by the new bulbs are no longer candidates
+            lit = selected[:, self.row_segment_table].any(axis=2)[:, self.row_segment_ids] | selected[:, self.col_segment_table].any(axis=2)[:, self.col_segment_ids]
+            cell_priorities[lit & (self.row_segment_ids >= 0)] = np.inf
+
+        return bulbs[:, :self.num_cells]
@@ -0,0 +1,235 @@
+import array
+
+
+def mask_indices(mask):
+    """Iterates over the positions of the set bits of integer mask in increasing order."""
+    # Searching the binary string is faster than repeatedly isolating the lowest bit of a large int
+    bits = bin(mask)[:1:-1]
+    index = bits.find('1')
+
+    while index >= 0:
+        yield index
+        index = bits.find('1', index + 1)
+
+
+class Bitboard:
+    def __init__(self, puzzle, mask=0):
+        """Initializes the Bitboard class.
+
+        Where puzzle is the LightUpPuzzle the bitboard belongs to and mask is an integer with
+        one bit set per bulb (bit position given by puzzle.get_index()).
+
+        A Bitboard behaves like a set of Coordinate objects, so it can be used anywhere
+        a set of bulbs is expected.
+        """
+        self.puzzle = puzzle
+        self.mask = mask
+
+
+    @property
+    def mask(self):
+        """The integer bitmask of bulb positions."""
+        return self._mask
+
+
+    @mask.setter
+    def mask(self, mask):
+        """Replaces the bulb positions, discarding the per-segment bulb counts and lighting state.
+
+        Use update() instead to keep them.
+        """
+        self._mask = mask
+        self.row_segment_counts = None
+        self.col_segment_counts = None
+        self.light_counts = None
+        self.num_lit = 0
+        self.num_conflicts = 0
+
+
+    def __contains__(self, coord):
+        """Returns True if there is a bulb at coordinate coord, False otherwise."""
+        return bool(self._mask >> self.puzzle.get_index(coord) & 1)
+
+
+    def __iter__(self):
+        """Iterates over the coordinates of the bulbs in order of cell index."""
+        for index in self.indices():
+            yield self.puzzle.get_coord(index)
+
+
+    def __len__(self):
+        """Returns the number of bulbs on the bitboard."""
+        return bin(self._mask).count('1')
+
+
+    def __eq__(self, other):
+        """Returns True if both bitboards hold the same bulbs, False otherwise."""
+        return isinstance(other, Bitboard) and self._mask == other._mask
+
+
+    def __hash__(self):
+        """Returns a hash representation of the bitboard."""
+        return hash(self._mask)
+
+
+    def __deepcopy__(self, memo):
+        """Returns a copy of the bitboard that shares the (immutable) puzzle reference."""
+        return self.copy()
+
+
+    def indices(self):
+        """Iterates over the cell indices of the bulbs in increasing order."""
+        return mask_indices(self._mask)
+
+
+    def count_segment_bulbs(self):
+        """Counts the bulbs in each row and column segment of the puzzle.
+
+        The counts are kept up to date by add() and discard() from then on.
+        """
+        self.row_segment_counts = array.array('l', [0]) * len(self.puzzle.row_segments)
+        self.col_segment_counts = array.array('l', [0]) * len(self.puzzle.col_segments)
+
+        for index in self.indices():
+            self.row_segment_counts[self.puzzle.row_segment_ids[index]] += 1
+            self.col_segment_counts[self.puzzle.col_segment_ids[index]] += 1
+
+
+    def segment_has_bulb(self, index):
+        """Returns True if the row or column segment of the cell with index index holds a bulb."""
+        if self.row_segment_counts is None:
+            self.count_segment_bulbs()
+
+        return bool(self.row_segment_counts[self.puzzle.row_segment_ids[index]] or self.col_segment_counts[self.puzzle.col_segment_ids[index]])
+
+
+    def track_lighting(self):
+        """Computes how many bulbs light each cell (self.light_counts), the number of lit cells
+        (self.num_lit) and the number of bulb pairs that shine on each other (self.num_conflicts).
+
+        These are kept up to date by add(), discard() and update() from then on, so the fitness
+        and validity of the bulbs can be read without rescanning the board.
+        """
+        if self.row_segment_counts is None:
+            self.count_segment_bulbs()
+
+        self.light_counts = array.array('i', [0]) * (self.puzzle.num_rows * self.puzzle.num_cols)
+        self.num_conflicts = 0
+
+        for segments, segment_counts in ((self.puzzle.row_segments, self.row_segment_counts), (self.puzzle.col_segments, self.col_segment_counts)):
+            for segment_id, count in enumerate(segment_counts):
+                if count:
+                    self.num_conflicts += count * (count - 1) // 2
+
+                    for index in segments[segment_id]:
+                        self.light_counts[index] += count
+
+        # Bulbs lie on both of their segments but only light their own cell once
+        for index in self.indices():
+            self.light_counts[index] -= 1
+
+        self.num_lit = len(self.light_counts) - self.light_counts.count(0)
+
+
+    def add_index(self, index):
+        """Places a bulb on the cell with index index, which must be a white square."""
+        if self._mask >> index & 1:
+            return
+
+        self._mask |= 1 << index
+
+        if self.row_segment_counts is None:
+            return
+
+        row_segment_id = self.puzzle.row_segment_ids[index]
+        col_segment_id = self.puzzle.col_segment_ids[index]
+
+        if self.light_counts is not None:
+            # Every bulb already on either segment now shines on the new bulb
+            self.num_conflicts += self.row_segment_counts[row_segment_id] + self.col_segment_counts[col_segment_id]
+
+            for segment in (self.puzzle.row_segments[row_segment_id], self.puzzle.col_segments[col_segment_id]):
+                for lit_index in segment:
+                    if lit_index != index:
+                        self.light_counts[lit_index] += 1
+
+                        if self.light_counts[lit_index] == 1:
+                            self.num_lit += 1
+
+            self.light_counts[index] += 1
+
+            if self.light_counts[index] == 1:
+                self.num_lit += 1
+
+        self.row_segment_counts[row_segment_id] += 1
+        self.col_segment_counts[col_segment_id] += 1
+
+
+    def discard_index(self, index):
+        """Removes the bulb on the cell with index index, if there is one."""
+        if not self._mask >> index & 1:
+            return
+
+        self._mask ^= 1 << index
+
+        if self.row_segment_counts is None:
+            return
+
+        row_segment_id = self.puzzle.row_segment_ids[index]
+        col_segment_id = self.puzzle.col_segment_ids[index]
+
+        self.row_segment_counts[row_segment_id] -= 1
+        self.col_segment_counts[col_segment_id] -= 1
+
+        if self.light_counts is not None:
+            self.num_conflicts -= self.row_segment_counts[row_segment_id] + self.col_segment_counts[col_segment_id]
+
+            for segment in (self.puzzle.row_segments[row_segment_id], self.puzzle.col_segments[col_segment_id]):
+                for lit_index in segment:
+                    if lit_index != index:
+                        self.light_counts[lit_index] -= 1
+
+                        if self.light_counts[lit_index] == 0:
+                            self.num_lit -= 1
+
+            self.light_counts[index] -= 1
+
+            if self.light_counts[index] == 0:
+                self.num_lit -= 1
+
+
+    def add(self, coord):
+        """Places a bulb at coordinate coord."""
+        self.add_index(self.puzzle.get_index(coord))
+
+
+    def discard(self, coord):
+        """Removes the bulb at coordinate coord, if there is one."""
+        self.discard_index(self.puzzle.get_index(coord))
+
+
+    def update(self, mask):
+        """Replaces the bulb positions with those in mask, only adding and removing the bulbs
+        that differ so that the segment counts and lighting state stay up to date.
+        """
+        for index in mask_indices(self._mask & ~mask):
+            self.discard_index(index)
+
+        for index in mask_indices(mask & ~self._mask):
+            self.add_index(index)
+
+
+    def copy(self):
+        """Returns a new Bitboard holding the same bulbs (and the same tracked state)."""
+        bitboard = Bitboard(self.puzzle, self._mask)
+
+        if self.row_segment_counts is not None:
+            bitboard.row_segment_counts = array.array('l', self.row_segment_counts)
+            bitboard.col_segment_counts = array.array('l', self.col_segment_counts)
+
+        if self.light_counts is not None:
+            bitboard.light_counts = array.array('i', self.light_counts)
+            bitboard.num_lit = self.num_lit
+            bitboard.num_conflicts = self.num_conflicts
+
+        return bitboard
@@ -0,0 +1,148 @@
+import bisect
+import itertools
+
+
+# States of the cells of a board under construction
+EMPTY = 0
+BLACK = 1
+BULB = 2
+
+
+class BoardGenerator:
+    def __init__(self, settings, num_rows, num_cols, rng):
+        """Initializes the BoardGenerator class.
+
+        Where settings is the Settings object of the puzzle, num_rows and num_cols are the
+        dimensions of the board to generate and rng is the random.Random instance it is drawn from.
+        """
+        self.settings = settings
+        self.rng = rng
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+
+        # Possible black square values and the cumulative weights they are drawn with
+        self.black_square_values = list(range(0, settings.adj_value_dont_care + 1))
+        self.black_square_cum_weights = list(itertools.accumulate(settings.black_square_value_weights))
+
+
+    def get_adj_indices(self, index):
+        """Returns the cell indices adjacent to the cell with index index, in the order of
+        LightUpPuzzle.get_adj_coords().
+        """
+        x, y = divmod(index, self.num_cols)
+        adj_indices = []
+
+        if not x == 0:
+            adj_indices.append(index - self.num_cols)
+
+        if not x == self.num_rows - 1:
+            adj_indices.append(index + self.num_cols)
+
+        if not y == 0:
+            adj_indices.append(index - 1)
+
+        if not y == self.num_cols - 1:
+            adj_indices.append(index + 1)
+
+        return adj_indices
+
+
+    def generate(self):
+        """Randomly generates a solvable board (see LightUpPuzzle's generate_random_board()).
+
+        Returns a dictionary of the cell indices of the black squares and their values, in order of placement.
+
+        Instead of walking rays across the board for every bulb placement, every row and column keeps
+        a sorted list of the positions of its black squares and bulbs. A bulb can be placed when the
+        nearest entries on either side of it in its row and column are not bulbs, which is found by
+        bisection. The board, and the random numbers drawn, are the same as those of placing bulbs
+        with LightUpPuzzle.place_bulb().
+        """
+        num_cols = self.num_cols
+        rng = self.rng
+        adj_value_dont_care = self.settings.adj_value_dont_care
+        black_square_placement_prob = self.settings.black_square_placement_prob
+        bulb_placement_prob = self.settings.bulb_placement_prob
+
+        cell_states = bytearray(self.num_rows * num_cols)
+        black_squares = {}
+
+        # Sorted column positions of the black squares and bulbs in each row, and row positions in each column
+        row_entries = [[] for _ in range(self.num_rows)]
+        col_entries = [[] for _ in range(num_cols)]
+
+        def add_entry(index, state):
+            """Puts a black square or bulb (given by state) on the cell with index index."""
+            x, y = divmod(index, num_cols)
+
+            cell_states[index] = state
+            bisect.insort(row_entries[x], y)
+            bisect.insort(col_entries[y], x)
+
+        def place_bulb(index):
+            """Attempts to place a bulb on the cell with index index, following the rules of
+            LightUpPuzzle.place_bulb().
+
+            Returns True on success, False on fail.
+            """
+            if cell_states[index] != EMPTY:
+                return False
+
+            x, y = divmod(index, num_cols)
+
+            # The nearest entries in the bulb's row and column must not be bulbs
+            entries = row_entries[x]
+            position = bisect.bisect_left(entries, y)
+
+            if (position > 0 and cell_states[x * num_cols + entries[position - 1]] == BULB) or (position < len(entries) and cell_states[x * num_cols + entries[position]] == BULB):
+                return False
+
+            entries = col_entries[y]
+            position = bisect.bisect_left(entries, x)
+
+            if (position > 0 and cell_states[entries[position - 1] * num_cols + y] == BULB) or (position < len(entries) and cell_states[entries[position] * num_cols + y] == BULB):
+                return False
+
+            # Bulbs cannot be placed next to zero-valued black squares
+            for adj_index in self.get_adj_indices(index):
+                if black_squares.get(adj_index) == 0:
+                    return False
+
+            add_entry(index, BULB)
+            return True
+
+
+        # Visit the cells in a random order (the shuffle matches that of a list of coordinates in row-major order)
+        shuffled_indices = list(range(self.num_rows * num_cols))
+        rng.shuffle(shuffled_indices)
+
+        for index in shuffled_indices:
+            if cell_states[index] == BULB:
+                continue
+
+            if rng.random() <= black_square_placement_prob:
+                # Place a black square
+                max_value = rng.choices(self.black_square_values, cum_weights=self.black_square_cum_weights)[0]
+
+                # A adj_value_dont_care black square is final; otherwise it is a placeholder that lets
+                # the maximum amount of bulbs be placed around it
+                black_squares[index] = adj_value_dont_care
+                add_entry(index, BLACK)
+
+                if max_value != adj_value_dont_care:
+                    adj_indices = self.get_adj_indices(index)
+                    num_placed_bulbs = 0
+
+                    for adj_index in adj_indices:
+                        if num_placed_bulbs < max_value and place_bulb(adj_index):
+                            num_placed_bulbs += 1
+
+                    # Black squares with value zero cannot have bulbs placed earlier next to them
+                    if num_placed_bulbs != 0 or not [i for i in adj_indices if cell_states[i] == BULB]:
+                        black_squares[index] = num_placed_bulbs
+
+            elif rng.random() <= bulb_placement_prob:
+                # Attempt to place a bulb
+                place_bulb(index)
+
+        return black_squares
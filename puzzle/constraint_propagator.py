@@ -0,0 +1,119 @@
+import puzzle.bitboard as bitboard_class
+
+
+class ConstraintPropagator:
+    def __init__(self, puzzle, enforce_adj_quotas=None):
+        """Initializes the ConstraintPropagator class.
+
+        Where puzzle is a LightUpPuzzle whose segments have been computed and enforce_adj_quotas
+        overrides the puzzle's setting of the same name if given. All board state is kept
+        as bitmasks over the puzzle's cell indices:
+            self.bulb_mask: bulbs every placement meeting the adjacency quotas must contain
+            self.lit_mask: squares lit by those bulbs
+            self.forbidden_mask: squares that can never hold a bulb
+        """
+        self.puzzle = puzzle
+        self.adj_value_dont_care = puzzle.settings.adj_value_dont_care
+        self.enforce_adj_quotas = puzzle.settings.enforce_adj_quotas if enforce_adj_quotas is None else enforce_adj_quotas
+
+        self.bulb_mask = 0
+        self.lit_mask = 0
+        self.forbidden_mask = 0
+        self.white_mask = 0
+
+        for index in range(puzzle.num_rows * puzzle.num_cols):
+            if puzzle.row_segment_ids[index] >= 0:
+                self.white_mask |= 1 << index
+
+        # Black squares with an adjacency quota and the indices of their white neighbours
+        self.quota_squares = []
+
+        for coord, value in puzzle.black_squares.items():
+            self.forbidden_mask |= 1 << puzzle.get_index(coord)
+
+            if value < self.adj_value_dont_care:
+                adj_indices = [puzzle.get_index(c) for c in puzzle.get_adj_coords(coord) if not c in puzzle.black_squares]
+                self.quota_squares.append((value, adj_indices))
+
+
+    def place_bulb(self, index):
+        """Places a bulb on the square with index index, lighting its segments.
+
+        Returns True on success, False if the square is already lit or forbidden (a contradiction, so
+        no bulb is placed).
+        """
+        if (self.lit_mask | self.forbidden_mask) >> index & 1:
+            return False
+
+        self.bulb_mask |= 1 << index
+        self.lit_mask |= self.puzzle.shine_masks[index]
+
+        return True
+
+
+    def rule_out_zero_square_neighbours(self):
+        """Forbids bulbs next to 0-squares, the only deduction that needs no adjacency quotas, as
+        place_bulb() of LightUpPuzzle never allows bulbs there either.
+        """
+        for value, adj_indices in self.quota_squares:
+            if value == 0:
+                for index in adj_indices:
+                    self.forbidden_mask |= 1 << index
+
+
+    def propagate(self):
+        """Applies the following rules until none of them changes the board:
+        1. Squares next to a black square whose quota is met (including 0-squares) cannot hold bulbs.
+        2. If a black square's quota equals its placed bulbs plus remaining candidates, all candidates get bulbs.
+
+        Both rules hold for every placement meeting the adjacency quotas, so they are only applied
+        if enforce_adj_quotas is set. No rule assumes the whole board can be lit, as the best
+        placement of many boards leaves squares unlit. If the rules reach a contradiction (a quota
+        that can no longer be met), the board has no placement meeting the quotas, and nothing but
+        the squares next to 0-squares is deduced, as without enforce_adj_quotas.
+
+        Returns True if the quota rules were applied, False otherwise.
+        """
+        if not self.enforce_adj_quotas:
+            self.rule_out_zero_square_neighbours()
+            return False
+
+        black_square_mask = self.forbidden_mask
+        changed = True
+
+        while changed:
+            changed = False
+
+            for value, adj_indices in self.quota_squares:
+                blocked_mask = self.lit_mask | self.forbidden_mask
+                num_bulbs = len([i for i in adj_indices if self.bulb_mask >> i & 1])
+                candidates = [i for i in adj_indices if not (self.bulb_mask | blocked_mask) >> i & 1]
+                consistent = num_bulbs <= value <= num_bulbs + len(candidates)
+
+                if consistent and candidates:
+                    if num_bulbs == value:
+                        for index in candidates:
+                            self.forbidden_mask |= 1 << index
+
+                        changed = True
+
+                    elif num_bulbs + len(candidates) == value:
+                        # A bulb may light the next candidate, which leaves the quota unmet
+                        consistent = all([self.place_bulb(index) for index in candidates])
+                        changed = True
+
+                if not consistent:
+                    # Deduce only what holds without the quotas
+                    self.bulb_mask = 0
+                    self.lit_mask = 0
+                    self.forbidden_mask = black_square_mask
+                    self.rule_out_zero_square_neighbours()
+
+                    return False
+
+        return True
+
+
+    def get_undecided_mask(self):
+        """Returns the bitmask of white squares that may or may not hold a bulb."""
+        return self.white_mask & ~(self.bulb_mask | self.lit_mask | self.forbidden_mask)
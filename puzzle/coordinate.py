@@ -1,23 +1,18 @@
-class Coordinate:
-    def __init__(self, x, y):
-        """Initializes the Coordinate class."""
-        self.x = x
-        self.y = y
+import collections
 
 
-    def __str__(self):
-        """Returns an ordered pair in string form."""
-        return '(' + str(self.x) + ', ' + str(self.y) + ')'
-
+class Coordinate(collections.namedtuple('Coordinate', ['x', 'y'])):
+    """An immutable (x, y) board position.
 
-    def __eq__(self, other):
-        """Returns True if the x & y member variables are equal, False otherwise."""
-        return self.x == other.x and self.y == other.y
+    Coordinates are tuples, so hashing and equality run in C. LightUpPuzzle interns one Coordinate
+    per cell (see LightUpPuzzle.coord_board), which should be reused instead of creating new ones.
+    """
+    __slots__ = ()
 
 
-    def __ne__(self, other):
-        """Returns True if neither the x nor y member variables are equal, False otherwise."""
-        return not self == other
+    def __str__(self):
+        """Returns an ordered pair in string form."""
+        return '(' + str(self.x) + ', ' + str(self.y) + ')'
 
 
     def __lt__(self, other):
@@ -42,6 +37,17 @@ class Coordinate:
         return self.y > other.y
 
 
-    def __hash__(self):
-        """Returns a hash representation of a coordinate."""
-        return (self.x + 1) * 100000 + self.y
+    def __le__(self, other):
+        """Returns True if self is less than or equal to other, False otherwise.
+
+        Comparison priority: y then x.
+        """
+        return not self > other
+
+
+    def __ge__(self, other):
+        """Returns True if self is greater than or equal to other, False otherwise.
+
+        Comparison priority: y then x.
+        """
+        return not self < other
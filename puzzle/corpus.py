@@ -0,0 +1,194 @@
+import array
+import mmap
+import puzzle.bitboard as bitboard_class
+import puzzle.constraint_propagator as constraint_propagator_class
+import struct
+import sys
+
+
+# Start of every corpus file, the number of instances after it and the index entry of each instance
+CORPUS_MAGIC = b'LUPCORP2'
+CORPUS_HEADER = '<i'
+CORPUS_INDEX_ENTRY = '<qqQ'
+
+# Header of each instance: num_rows, num_cols and the lengths of its arrays (see encode_board())
+INSTANCE_HEADER = '<7i'
+
+
+class Corpus:
+    def __init__(self, corpus_file_path):
+        """Initializes the Corpus class.
+
+        Where corpus_file_path is a corpus file written by write(). The file is memory-mapped, so
+        loading an instance only reads the pages holding that instance.
+        """
+        self.corpus_file_path = corpus_file_path
+
+        with open(corpus_file_path, 'rb') as corpus_file:
+            self.data = mmap.mmap(corpus_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self.data[:len(CORPUS_MAGIC)] != CORPUS_MAGIC:
+            raise ValueError(corpus_file_path + ' is not a puzzle corpus file of this version')
+
+        position = len(CORPUS_MAGIC)
+        num_instances, = struct.unpack_from(CORPUS_HEADER, self.data, position)
+        position += struct.calcsize(CORPUS_HEADER)
+
+        # (offset, seed) of every instance
+        self.index = []
+
+        for _ in range(num_instances):
+            offset, _, seed = struct.unpack_from(CORPUS_INDEX_ENTRY, self.data, position)
+            self.index.append((offset, seed))
+            position += struct.calcsize(CORPUS_INDEX_ENTRY)
+
+
+    def __len__(self):
+        """Returns the number of instances in the corpus."""
+        return len(self.index)
+
+
+    def get_seed(self, instance_id):
+        """Returns the seed of the random.Random instance that generated instance instance_id."""
+        return self.index[instance_id][1]
+
+
+    def get_board(self, instance_id):
+        """Returns the prepared board of instance instance_id (see decode_board()).
+
+        This is passed to LightUpPuzzle, which then skips building and preprocessing the board.
+        """
+        if not 0 <= instance_id < len(self.index):
+            raise ValueError('corpus ' + self.corpus_file_path + ' has no instance ' + str(instance_id) + ' (it holds ' + str(len(self.index)) + ')')
+
+        return self.decode_board(self.data, self.index[instance_id][0])
+
+
+    @staticmethod
+    def decode_board(data, position=0):
+        """Returns the board encoded by encode_board() at position position of data (bytes or an mmap),
+        a dictionary holding: num_rows, num_cols, black_squares (a list of (cell index, value) pairs in
+        placement order), row_segments, col_segments, row_segment_ids, col_segment_ids and
+        bulb_forbidden (as built by LightUpPuzzle's generate_ray_index()), and forced_bulb_mask and
+        undecided_mask (the results of constraint propagation, see ConstraintPropagator).
+        """
+        num_rows, num_cols, num_black_squares, num_row_segments, num_col_segments, num_forced_bulbs, num_undecided = struct.unpack_from(INSTANCE_HEADER, data, position)
+        position += struct.calcsize(INSTANCE_HEADER)
+        num_cells = num_rows * num_cols
+
+        def read_array(length):
+            """Returns the next length 32 bit integers of the instance as an array."""
+            nonlocal position
+
+            values = array.array('i')
+            values.frombytes(data[position:position + 4 * length])
+            position += 4 * length
+
+            if sys.byteorder == 'big':
+                values.byteswap()
+
+            return values
+
+        black_square_indices = read_array(num_black_squares)
+        black_square_values = read_array(num_black_squares)
+
+        # Row segments are runs of consecutive cell indices and column segments runs of cell indices num_cols apart
+        row_segment_starts = read_array(num_row_segments)
+        row_segment_lengths = read_array(num_row_segments)
+        col_segment_starts = read_array(num_col_segments)
+        col_segment_lengths = read_array(num_col_segments)
+
+        row_segment_ids = array.array('l', read_array(num_cells))
+        col_segment_ids = array.array('l', read_array(num_cells))
+        forced_bulb_indices = read_array(num_forced_bulbs)
+        undecided_indices = read_array(num_undecided)
+
+        bulb_forbidden = bytearray(data[position:position + num_cells])
+
+        return {
+            'num_rows': num_rows,
+            'num_cols': num_cols,
+            'black_squares': list(zip(black_square_indices, black_square_values)),
+            'row_segments': [array.array('l', range(start, start + length)) for start, length in zip(row_segment_starts, row_segment_lengths)],
+            'col_segments': [array.array('l', range(start, start + length * num_cols, num_cols)) for start, length in zip(col_segment_starts, col_segment_lengths)],
+            'row_segment_ids': row_segment_ids,
+            'col_segment_ids': col_segment_ids,
+            'bulb_forbidden': bulb_forbidden,
+            'forced_bulb_mask': sum(1 << index for index in forced_bulb_indices),
+            'undecided_mask': sum(1 << index for index in undecided_indices)
+        }
+
+
+    @staticmethod
+    def encode_board(puzzle):
+        """Returns the board of the LightUpPuzzle puzzle and its precomputed structures as bytes (see
+        decode_board()).
+
+        The result of constraint propagation with the adjacency quotas enforced is taken from the
+        puzzle if it was created with it and computed here otherwise. The puzzle's bulb_forbidden is
+        stored as it is.
+        """
+        if puzzle.placement_coords is not None and puzzle.settings.enforce_adj_quotas:
+            forced_bulb_indices = list(bitboard_class.mask_indices(puzzle.forced_bulb_mask))
+            undecided_indices = [puzzle.get_index(coord) for coord in puzzle.placement_coords]
+
+        else:
+            propagator = constraint_propagator_class.ConstraintPropagator(puzzle, enforce_adj_quotas=True)
+            propagator.propagate()
+
+            forced_bulb_indices = list(bitboard_class.mask_indices(propagator.bulb_mask))
+            undecided_indices = list(bitboard_class.mask_indices(propagator.get_undecided_mask()))
+
+        black_squares = [(puzzle.get_index(coord), value) for coord, value in puzzle.black_squares.items()]
+
+        columns = [
+            [index for index, _ in black_squares],
+            [value for _, value in black_squares],
+            [segment[0] for segment in puzzle.row_segments],
+            [len(segment) for segment in puzzle.row_segments],
+            [segment[0] for segment in puzzle.col_segments],
+            [len(segment) for segment in puzzle.col_segments],
+            puzzle.row_segment_ids,
+            puzzle.col_segment_ids,
+            forced_bulb_indices,
+            undecided_indices
+        ]
+
+        board = bytearray(struct.pack(INSTANCE_HEADER, puzzle.num_rows, puzzle.num_cols, len(black_squares), len(puzzle.row_segments), len(puzzle.col_segments), len(forced_bulb_indices), len(undecided_indices)))
+
+        for column in columns:
+            values = array.array('i', column)
+
+            if sys.byteorder == 'big':
+                values.byteswap()
+
+            board += values.tobytes()
+
+        board += puzzle.bulb_forbidden
+
+        return bytes(board)
+
+
+    @staticmethod
+    def write(corpus_file_path, puzzles, seeds):
+        """Writes the boards of the LightUpPuzzles in the list puzzles to a corpus file at corpus_file_path.
+
+        Where seeds holds the seed each puzzle was generated with. The puzzles should be created
+        without constraint propagation, which is performed here and stored alongside each board
+        (see encode_board()).
+        """
+        instances = [Corpus.encode_board(puzzle) for puzzle in puzzles]
+
+        # Instances are stored one after another, following the header and index
+        offset = len(CORPUS_MAGIC) + struct.calcsize(CORPUS_HEADER) + len(instances) * struct.calcsize(CORPUS_INDEX_ENTRY)
+
+        with open(corpus_file_path, 'wb') as corpus_file:
+            corpus_file.write(CORPUS_MAGIC)
+            corpus_file.write(struct.pack(CORPUS_HEADER, len(instances)))
+
+            for instance, seed in zip(instances, seeds):
+                corpus_file.write(struct.pack(CORPUS_INDEX_ENTRY, offset, len(instance), seed))
+                offset += len(instance)
+
+            for instance in instances:
+                corpus_file.write(instance)
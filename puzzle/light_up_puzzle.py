@@ -1,20 +1,34 @@
+import array
 import copy
+import puzzle.bitboard as bitboard_class
+import puzzle.board_generator as board_generator_class
+import puzzle.constraint_propagator as constraint_propagator_class
 import puzzle.coordinate as coord_class
+import puzzle.shine_masks as shine_masks_class
 import random
 import time
 
 
+# Largest board (in cells) whose shine masks are all precomputed, see generate_ray_index()
+MAX_PRECOMPUTED_SHINE_MASK_CELLS = 40000
+
+
 class LightUpPuzzle:
-    def __init__(self, config):
+    def __init__(self, config, board=None, rng=None):
         """Initializes the LightUpPuzzle class.
 
-        Where config is a Config object for the light up puzzle problem.
+        Where config is a Config object for the light up puzzle problem. If board is given, it is a
+        board prepared in advance by a Corpus (see Corpus.get_board()), which is used instead of
+        generating or reading a board, and whose precomputed structures are used as they are
+        (apart from constraint propagation without adjacency quotas, which is quick to redo).
+        A random board is drawn from rng, a random.Random instance (an unseeded one if None).
         """
 
         def generate_coord_boards():
-            """Generates a 2D coordinate board and its transpose.
+            """Generates a 2D coordinate board and the list of adjacent coordinates of every square.
 
-            These are used when verifying solutions and creating random boards.
+            These are used when verifying solutions and creating random boards. Every square has
+            exactly one Coordinate object, which all other board structures share.
             """
             self.coord_board = []
 
@@ -25,7 +39,148 @@ class LightUpPuzzle:
 
                 self.coord_board.append(coord_list)
 
-            self.transpose_coord_board = [list(l) for l in zip(*self.coord_board)]
+            self.adj_coord_board = []
+
+            for x in range(self.num_rows):
+                adj_coord_list = []
+                for y in range(self.num_cols):
+                    adj_coords = []
+
+                    if not x == 0:
+                        adj_coords.append(self.coord_board[x - 1][y])
+
+                    if not x == self.num_rows - 1:
+                        adj_coords.append(self.coord_board[x + 1][y])
+
+                    if not y == 0:
+                        adj_coords.append(self.coord_board[x][y - 1])
+
+                    if not y == self.num_cols - 1:
+                        adj_coords.append(self.coord_board[x][y + 1])
+
+                    adj_coord_list.append(adj_coords)
+
+                self.adj_coord_board.append(adj_coord_list)
+
+
+        def generate_ray_index():
+            """Precomputes the row and column segments of white squares on the board.
+
+            A segment is a maximal run of white squares in a row or column, bounded by black squares
+            or the edge of the board. Segments are stored as arrays of cell indices (see get_index()).
+            A bulb lights exactly its own row and column segments, so the squares lit by a bulb at each
+            cell are stored once as a bitmask in self.shine_masks for use in check_valid_solution()
+            (on boards above MAX_PRECOMPUTED_SHINE_MASK_CELLS cells, self.shine_masks computes them on request).
+            Squares where a bulb may never be placed are flagged in self.bulb_forbidden.
+
+            This function should only be called in __init__, after the board is finalized.
+            """
+            num_cells = self.num_rows * self.num_cols
+
+            self.row_segments = []
+            self.col_segments = []
+            self.row_segment_ids = array.array('l', [-1]) * num_cells
+            self.col_segment_ids = array.array('l', [-1]) * num_cells
+
+            def add_segments(coord_lists, segments, segment_ids):
+                """Splits each list of coordinates into segments at black squares."""
+                for coord_list in coord_lists:
+                    segment = array.array('l')
+
+                    for coord in coord_list:
+                        if coord in self.black_squares:
+                            if len(segment):
+                                segments.append(segment)
+                                segment = array.array('l')
+
+                        else:
+                            index = self.get_index(coord)
+                            segment_ids[index] = len(segments)
+                            segment.append(index)
+
+                    if len(segment):
+                        segments.append(segment)
+
+            add_segments(self.coord_board, self.row_segments, self.row_segment_ids)
+            add_segments(zip(*self.coord_board), self.col_segments, self.col_segment_ids)
+
+            generate_shine_masks()
+
+            # Flag squares that can never hold a bulb: black squares and squares next to zero-valued black squares
+            self.bulb_forbidden = bytearray(num_cells)
+
+            for coord, value in self.black_squares.items():
+                self.bulb_forbidden[self.get_index(coord)] = 1
+
+                if value == 0:
+                    for adj_coord in self.get_adj_coords(coord):
+                        self.bulb_forbidden[self.get_index(adj_coord)] = 1
+
+
+        def generate_shine_masks():
+            """Stores the bitmask of the squares lit by a bulb at each cell in self.shine_masks, once
+            the segments are known (see generate_ray_index()).
+            """
+            num_cells = self.num_rows * self.num_cols
+
+            if num_cells <= MAX_PRECOMPUTED_SHINE_MASK_CELLS:
+                row_segment_masks = [sum(1 << index for index in segment) for segment in self.row_segments]
+                col_segment_masks = [sum(1 << index for index in segment) for segment in self.col_segments]
+
+                # Black squares do not shine, so their mask is left empty
+                self.shine_masks = [0] * num_cells
+
+                for index in range(num_cells):
+                    if self.row_segment_ids[index] >= 0:
+                        self.shine_masks[index] = row_segment_masks[self.row_segment_ids[index]] | col_segment_masks[self.col_segment_ids[index]]
+
+            else:
+                # Every mask is as wide as the board, so they are computed when needed instead
+                self.shine_masks = shine_masks_class.ShineMasks(self)
+
+
+        def generate_quota_table():
+            """Stores each black square with an adjacency quota (a value below adj_value_dont_care) in
+            self.quota_squares as a (quota, tuple of the cell indices of its white neighbours) pair, so
+            that check_adj_quotas() needs no coordinates. Squares with the highest quotas come first,
+            as they are the most likely to be unmet.
+
+            The table is only filled when enforce_adj_quotas is set.
+            This function should only be called in __init__, after the board is finalized.
+            """
+            self.quota_squares = []
+
+            if not self.settings.enforce_adj_quotas:
+                return
+
+            for coord, value in self.black_squares.items():
+                if value < self.settings.adj_value_dont_care:
+                    adj_indices = tuple(self.get_index(adj_coord) for adj_coord in self.get_adj_coords(coord) if adj_coord not in self.black_squares)
+                    self.quota_squares.append((value, adj_indices))
+
+            self.quota_squares.sort(key=lambda quota_square: quota_square[0], reverse=True)
+
+
+        def load_board():
+            """Takes the board and its segments from the prepared board board (see Corpus.get_board()).
+
+            This function should only be called in __init__
+            """
+            self.num_rows = board['num_rows']
+            self.num_cols = board['num_cols']
+
+            generate_coord_boards()
+
+            for index, value in board['black_squares']:
+                self.black_squares[self.get_coord(index)] = value
+
+            self.row_segments = board['row_segments']
+            self.col_segments = board['col_segments']
+            self.row_segment_ids = board['row_segment_ids']
+            self.col_segment_ids = board['col_segment_ids']
+            self.bulb_forbidden = board['bulb_forbidden']
+
+            generate_shine_masks()
 
 
         def generate_random_board():
@@ -34,164 +189,214 @@ class LightUpPuzzle:
             Solvable boards are generated by iteratively placing black squares (with probability
             dictated by the configuration file) and required bulbs around each square. Bulbs
             are also placed randomly around the board (not neighboring black squares). All bulbs are
-            then removed, leaving a board with at least one solution.
+            then removed, leaving a board with at least one solution (see BoardGenerator).
 
             This function should only be called in __init__
             """
             self.black_squares = {}
-            bulbs = set([])
 
-            if int(self.config.settings["override_random_board_dimensions"]):
-                self.num_rows = int(self.config.settings["override_num_rows"])
-                self.num_cols = int(self.config.settings["override_num_cols"])
+            if self.settings.override_random_board_dimensions:
+                self.num_rows = self.settings.override_num_rows
+                self.num_cols = self.settings.override_num_cols
 
             else:
-                min_dimension = int(self.config.settings["min_random_board_dimension"])
-                max_dimension = int(self.config.settings["max_random_board_dimension"])
+                min_dimension = self.settings.min_random_board_dimension
+                max_dimension = self.settings.max_random_board_dimension
 
-                self.num_rows = random.randint(min_dimension, max_dimension)
-                self.num_cols = random.randint(min_dimension, max_dimension)
+                self.num_rows = rng.randint(min_dimension, max_dimension)
+                self.num_cols = rng.randint(min_dimension, max_dimension)
 
             generate_coord_boards()
 
-            # Create a list of shuffled coordinates used in assigning black squares & bulbs
-            shuffled_coords = []
-            for row in self.coord_board:
-                for coord in row:
-                    shuffled_coords.append(coord)
-
-            random.shuffle(shuffled_coords)
-
-            # Assign black squares & bulbs to the board
-            for coord in shuffled_coords:
-                if not coord in bulbs: 
-                    if random.random() <= float(self.config.settings["black_square_placement_prob"]):
-                        # Place a black square
-                        adj_coord_list = self.get_adj_coords(coord)
-                        num_placed_bulbs = 0
-
-                        # Compute the random max value for this black square
-                        max_value = random.choices(list(range(0, int(self.config.settings["adj_value_dont_care"]) + 1)), [int(n) for n in self.config.settings["black_square_value_weights"].split(',')])[0]
-
-                        if max_value == int(self.config.settings["adj_value_dont_care"]):
-                            # Always place a black square with value adj_value_dont_care
-                            self.black_squares[coord] = max_value
-                        
-                        else:
-                            # Put a placeholder black square to ensure the maximum amount of bulbs can be placed
-                            self.black_squares[coord] = int(self.config.settings["adj_value_dont_care"])
-
-                            # Place bulbs around the square, if allowed
-                            for adj_coord in adj_coord_list:
-                                if num_placed_bulbs < max_value and self.place_bulb(adj_coord, bulbs):
-                                    num_placed_bulbs += 1
-
-                            # Account for black square placements with value zero
-                            if num_placed_bulbs == 0 and len([c for c in self.get_adj_coords(coord) if c in bulbs]):
-                                # Place a adj_value_dont_care black square to preserve the bulb placement validity
-                                self.black_squares[coord] = int(self.config.settings["adj_value_dont_care"])
-                                
-                            else:
-                                # Update the real black square value to match the number of adjacent bulbs
-                                self.black_squares[coord] = num_placed_bulbs
-                    
-                    elif random.random() <= float(self.config.settings["bulb_placement_prob"]):
-                        # Attempt to place a bulb
-                        self.place_bulb(coord, bulbs)
+            board_generator = board_generator_class.BoardGenerator(self.settings, self.num_rows, self.num_cols, rng)
+
+            for index, value in board_generator.generate().items():
+                self.black_squares[self.get_coord(index)] = value
 
 
         self.black_squares = {}
         self.config = config
+        self.settings = config.get_settings()
+
+        if rng is None:
+            rng = random.Random()
+
+        # Bulbs every bulb container starts with and the squares random bulb placements are drawn from
+        self.forced_bulb_mask = 0
+        self.placement_coords = None
+
+        # place_bulb() calls made by place_bulb_randomly() and how many of them failed (see Profiler)
+        self.num_place_bulb_calls = 0
+        self.num_place_bulb_failures = 0
+
+        if board is not None:
+            # Use a board prepared in advance, along with its segments
+            load_board()
 
-        if int(self.config.settings["generate_uniform_random_puzzle"]):
+        elif self.settings.generate_uniform_random_puzzle:
             # Generate random initial board state
             generate_random_board()
 
         else:
             # Read initial board state
-            with open(self.config.settings["input_file_path"], 'r') as input_file:
+            with open(self.settings.input_file_path, 'r') as input_file:
                 # Read line 0 (number of columns)
                 self.num_cols = int(input_file.readline())
 
                 # Read line 1 (number of rows)
                 self.num_rows = int(input_file.readline())
 
+                # Generate coordinate versions of the board
+                generate_coord_boards()
+
                 # Read line 2 to eof (coordinates of black squares and their adjacency values)
                 for row in input_file:
                     black_square_data = [int(i) for i in row.split()]
-                    self.black_squares[coord_class.Coordinate(black_square_data[1] - 1, black_square_data[0] - 1)] = black_square_data[2]
+                    self.black_squares[self.coord_board[black_square_data[1] - 1][black_square_data[0] - 1]] = black_square_data[2]
 
-            # Generate coordinate versions of the board
-            generate_coord_boards()
+        if board is None:
+            # Precompute where a bulb placed on each square would shine
+            generate_ray_index()
 
+        # Precompute the neighbours of every black square with an adjacency quota
+        generate_quota_table()
 
-    def get_random_coord(self):
-        """Returns a random coordinate ranging in the space (num_cols, num_rows)."""
-        return coord_class.Coordinate(random.randint(0, self.num_rows - 1), random.randint(0, self.num_cols - 1))
+        self.num_shined_squares = 0
 
+        if self.settings.use_constraint_propagation:
+            if board is not None and self.settings.enforce_adj_quotas:
+                # Prepared boards hold the result of propagation with the adjacency quotas enforced
+                self.propagate_constraints(board['forced_bulb_mask'], board['undecided_mask'])
+            else:
+                self.propagate_constraints()
+
+
+    def propagate_constraints(self, forced_bulb_mask=None, undecided_mask=None):
+        """Deduces the bulbs that any solution lighting the whole board must contain (see
+        ConstraintPropagator) and restricts bulb placement to the squares left undecided.
+
+        The deduced bulbs are added to every container returned by create_bulbs(), every other
+        decided square is forbidden to hold a bulb, and random placements only draw undecided squares.
+        If forced_bulb_mask and undecided_mask are given, they are used as the result of propagation.
+        """
+        if forced_bulb_mask is None:
+            propagator = constraint_propagator_class.ConstraintPropagator(self)
+            propagator.propagate()
+
+            forced_bulb_mask = propagator.bulb_mask
+            undecided_mask = propagator.get_undecided_mask()
+
+        self.forced_bulb_mask = forced_bulb_mask
+
+        for index in range(self.num_rows * self.num_cols):
+            if not undecided_mask >> index & 1:
+                self.bulb_forbidden[index] = 1
+
+        self.placement_coords = [self.get_coord(index) for index in bitboard_class.mask_indices(undecided_mask)]
 
-    def get_adj_coords(self, coord):
-        """Returns a list of coordinates adjacent to coordinate coord"""
-        adj_coords = []
 
-        if not coord.x == 0:
-            adj_coords.append(coord_class.Coordinate(coord.x - 1, coord.y))
+    def get_index(self, coord):
+        """Returns the cell index of coordinate coord, used as its bit position in board bitmasks."""
+        return coord.x * self.num_cols + coord.y
 
-        if not coord.x == self.num_rows - 1:
-            adj_coords.append(coord_class.Coordinate(coord.x + 1, coord.y))
 
-        if not coord.y == 0:
-            adj_coords.append(coord_class.Coordinate(coord.x, coord.y - 1))
+    def get_coord(self, index):
+        """Returns the coordinate with cell index index (the inverse of get_index())."""
+        return self.coord_board[index // self.num_cols][index % self.num_cols]
 
-        if not coord.y == self.num_cols - 1:
-            adj_coords.append(coord_class.Coordinate(coord.x, coord.y + 1))
 
-        return adj_coords
+    def create_bulbs(self, bulb_mask=None):
+        """Returns a new bulb container for this board, holding the bulbs in bulb_mask or, if it is None,
+        only the bulbs deduced by propagate_constraints() (if enabled).
+
+        This is a Bitboard if use_bitboard_genotype is set in config, a set of Coordinate
+        objects otherwise. If use_incremental_evaluation is also set, the Bitboard tracks its
+        lighting as bulbs are added and removed (see Bitboard.track_lighting()).
+        """
+        if bulb_mask is None:
+            bulb_mask = self.forced_bulb_mask
+
+        if self.settings.use_bitboard_genotype:
+            bitboard = bitboard_class.Bitboard(self, bulb_mask)
+
+            if self.settings.use_incremental_evaluation:
+                bitboard.track_lighting()
+
+            return bitboard
+
+        return set([self.get_coord(index) for index in bitboard_class.mask_indices(bulb_mask)])
+
+
+    def get_bulb_mask(self, bulbs):
+        """Returns the bitmask of bulb positions in bulbs, a set of coordinates or a Bitboard."""
+        if isinstance(bulbs, bitboard_class.Bitboard):
+            return bulbs.mask
+
+        # Set the bits in a byte array, as or-ing each bit into a large int copies it
+        bulb_bytes = bytearray((self.num_rows * self.num_cols + 7) // 8)
+
+        for bulb_coord in bulbs:
+            index = self.get_index(bulb_coord)
+            bulb_bytes[index >> 3] |= 1 << (index & 7)
+
+        return int.from_bytes(bulb_bytes, 'little')
+
+
+    def get_random_coord(self, rng):
+        """Returns a random coordinate ranging in the space (num_cols, num_rows), drawn from rng (a random.Random instance)."""
+        return self.coord_board[rng.randint(0, self.num_rows - 1)][rng.randint(0, self.num_cols - 1)]
+
+
+    def get_adj_coords(self, coord):
+        """Returns a list of coordinates adjacent to coordinate coord.
+
+        The list is shared between calls and must not be modified.
+        """
+        return self.adj_coord_board[coord.x][coord.y]
 
 
     def place_bulb(self, coord, bulbs):
-        """Attempts to place a bulb at coord position on the board.
+        """Attempts to place a bulb at coord position on the board, adding it to bulbs (a set of
+        coordinates or a Bitboard).
 
         Returns True on success, False on fail.
         """
         if coord in self.black_squares:
             return False # Can't place a bulb on a black square 
 
-        # Check for cross-shine in the coordinate's row (same x value)
-        matching_x_coord_bulbs = [c for c in bulbs if c.x == coord.x]
-        num_x_delimeters = 0
-
-        for bulb_coord in matching_x_coord_bulbs:
-            min_y = min(bulb_coord.y, coord.y)
-            max_y = max(bulb_coord.y, coord.y)
+        if isinstance(bulbs, bitboard_class.Bitboard):
+            # Bitboards track how many bulbs occupy each segment, so legality is a lookup
+            index = self.get_index(coord)
 
-            if max_y - min_y < 2:
+            if self.bulb_forbidden[index] or bulbs.segment_has_bulb(index):
                 return False
 
-            for black_coord in [c for c in self.black_squares if c.x == coord.x]:
-                if black_coord.y < max_y and black_coord.y > min_y:
-                    num_x_delimeters += 1
+            bulbs.add(coord)
+            return True
 
-        if num_x_delimeters < len(matching_x_coord_bulbs):
+        if coord in bulbs:
             return False
 
-        # Check for cross-shine in the coordinate's column (same y value)
-        matching_y_coord_bulbs = [c for c in bulbs if c.y == coord.y]
-        num_y_delimeters = 0
+        if self.placement_coords is not None and self.bulb_forbidden[self.get_index(coord)]:
+            return False # Ruled out by constraint propagation
 
-        for bulb_coord in matching_y_coord_bulbs:
-            min_x = min(bulb_coord.x, coord.x)
-            max_x = max(bulb_coord.x, coord.x)
+        # Check for cross-shine by walking from the coordinate along its row and column
+        # The board may still be under construction, so the precomputed segments are not used here
+        for x_step, y_step in ((0, -1), (0, 1), (-1, 0), (1, 0)):
+            x = coord.x + x_step
+            y = coord.y + y_step
 
-            if max_x - min_x < 2:
-                return False
+            while 0 <= x < self.num_rows and 0 <= y < self.num_cols:
+                ray_coord = self.coord_board[x][y]
 
-            for black_coord in [c for c in self.black_squares if c.y == coord.y]:
-                if black_coord.x < max_x and black_coord.x > min_x:
-                    num_y_delimeters += 1
+                if ray_coord in self.black_squares:
+                    break # Shine cannot propagate any further
 
-        if num_y_delimeters < len(matching_y_coord_bulbs):
-            return False
+                if ray_coord in bulbs:
+                    return False
+
+                x += x_step
+                y += y_step
 
         # Check placement of bulbs next to zero-valued black square
         if len([c for c in self.get_adj_coords(coord) if c in self.black_squares and self.black_squares[c] == 0]) == 0:
@@ -205,7 +410,7 @@ class LightUpPuzzle:
         """Prints a string representation of the board.
 
         '_' Empty white square
-        'x' Black square (with 0 <= x <= self.config.settings["adj_value_dont_care"])
+        'x' Black square (with 0 <= x <= self.settings.adj_value_dont_care)
         '!' Light bulb
         """
         board = [ [ '_' for col in range(self.num_cols) ] for row in range(self.num_rows) ]
@@ -247,86 +452,150 @@ class LightUpPuzzle:
         return num_adj_black_squares 
 
 
-    def check_valid_solution(self, bulbs):
-        """Checks to see if the board is valid.
+    def check_adj_quotas(self, bulb_mask):
+        """Returns True if every black square with an adjacency quota has exactly that many bulbs
+        among its neighbours, where bulb_mask is the bitmask of bulb positions.
+
+        Stops at the first unmet quota (see generate_quota_table() in __init__).
+        """
+        # Bits are read from the bytes of the mask, as shifting a large int copies it
+        bulb_bytes = bulb_mask.to_bytes((self.num_rows * self.num_cols + 7) // 8, 'little')
+
+        for adj_value, adj_indices in self.quota_squares:
+            num_adj_bulbs = 0
+
+            for index in adj_indices:
+                num_adj_bulbs += bulb_bytes[index >> 3] >> (index & 7) & 1
+
+            if num_adj_bulbs != adj_value:
+                return False
+
+        return True
 
-        Returns True if the following conditions are met:
+
+    def evaluate_bulbs(self, bulbs):
+        """Evaluates bulbs, a set of coordinates or a Bitboard, without modifying the puzzle.
+
+        Returns a tuple (fitness, num_lit, valid) where num_lit is the number of squares lit by the
+        bulbs, valid is True if the following conditions are met:
         1. No bulbs shine on eachother. (guaranteed by place_bulb() function)
         2. Every black square has the required adjacent bulbs. (can be disabled using config file setting)
+        and fitness is num_lit for valid bulbs, 0 otherwise.
+
+        Bitboards that track their lighting are checked against the adjacency quotas only if no bulbs
+        shine on eachother. Other bulbs are checked against the quotas first, so that bulbs failing
+        them are rejected without computing their lighting: num_lit is None for them.
         """
-        # Create and populate set of shined squares
-        self.shined_squares = set([])
+        valid = True
 
-        for bulb_coord in bulbs:
-            # Create a list of adjacency lists - used for determining where the bulb shines
-            adj_coord_lists = []
-
-            adj_coord_lists.append(self.coord_board[bulb_coord.x][:bulb_coord.y][::-1])           # Row from this column to the left
-            adj_coord_lists.append(self.coord_board[bulb_coord.x][bulb_coord.y + 1:])             # Row from this column to the right
-            adj_coord_lists.append(self.transpose_coord_board[bulb_coord.y][:bulb_coord.x][::-1]) # Column from this row up
-            adj_coord_lists.append(self.transpose_coord_board[bulb_coord.y][bulb_coord.x + 1:])   # Column from this row down
-
-            for coord_list in adj_coord_lists:
-                for coord in coord_list:
-                    if coord in self.black_squares:
-                        break # Shine cannot propagate any further
-                    elif coord in bulbs:
-                        # Redundant check for bulb on bulb shining
-                        # Nullify the fitness of this board
-                        self.shined_squares = set([])
-                        return False
-                    else:
-                        self.shined_squares.add(coord)
-
-        # Ensure bulbs count as shined squares
-        for bulb_coord in bulbs:
-            self.shined_squares.add(bulb_coord)
-
-        # Check black square conditions
-        if int(self.config.settings["enforce_adj_quotas"]):
-            for coord, adj_value in self.black_squares.items():
-                if adj_value < int(self.config.settings["adj_value_dont_care"]) and self.get_num_bulbs(self.get_adj_coords(coord), bulbs) != adj_value:
-                    # Nullify the fitness of this board
-                    self.shined_squares = set([])
-                    return False
+        if isinstance(bulbs, bitboard_class.Bitboard) and bulbs.light_counts is not None:
+            # The bitboard keeps its lighting up to date, so there is nothing to rescan
+            num_lit = bulbs.num_lit
+            valid = not bulbs.num_conflicts
 
-        return True
+            # Check black square conditions
+            if valid and self.settings.enforce_adj_quotas:
+                valid = self.check_adj_quotas(bulbs.mask)
+
+        else:
+            # Create a bitmask of bulb positions
+            bulb_mask = self.get_bulb_mask(bulbs)
 
+            # Check black square conditions before walking any rays
+            if self.settings.enforce_adj_quotas and not self.check_adj_quotas(bulb_mask):
+                return 0, None, False
 
-    def place_bulb_randomly(self, bulbs):
-        """Attempts to put a bulb randomly on the board in a valid location.
+            if isinstance(bulbs, bitboard_class.Bitboard):
+                bulb_indices = bulbs.indices()
+            else:
+                bulb_indices = [self.get_index(bulb_coord) for bulb_coord in bulbs]
+
+            # Populate the bitmask of shined squares from the precomputed segments
+            # Bulbs count as shined squares since each bulb lies on its own segments
+            shined_mask = 0
+
+            for index in bulb_indices:
+                shine_mask = self.shine_masks[index]
+
+                if bulb_mask & shine_mask != 1 << index:
+                    # Redundant check for bulb on bulb shining
+                    valid = False
+
+                shined_mask |= shine_mask
+
+            num_lit = bin(shined_mask).count('1')
+
+        # Invalid boards have their fitness nullified
+        return (num_lit if valid else 0), num_lit, valid
+
+
+    def check_valid_solution(self, bulbs):
+        """Checks to see if the board is valid, where bulbs is a set of coordinates or a Bitboard.
+
+        Returns True if the conditions listed in evaluate_bulbs() are met, False otherwise.
+        The resulting fitness is available from get_fitness().
+        """
+        self.num_shined_squares, _, valid = self.evaluate_bulbs(bulbs)
+
+        return valid
+
+
+    def place_bulb_randomly(self, bulbs, rng):
+        """Attempts to put a bulb randomly on the board in a valid location, drawn from rng (a random.Random instance).
 
         Stops trying to put a bulb after max_num_random_bulb_placements tries.
         Returns True if successful, False otherwise.
         """
-        coord = self.get_random_coord()
+        if self.placement_coords is not None:
+            if not self.placement_coords:
+                return False # Constraint propagation left no square undecided
+
+            get_coord = lambda: rng.choice(self.placement_coords)
+        else:
+            get_coord = lambda: self.get_random_coord(rng)
+
+        coord = get_coord()
         count = 0
 
-        while count < int(self.config.settings["max_num_random_bulb_placements"]) and not self.place_bulb(coord, bulbs):
-            coord = self.get_random_coord()
+        while count < self.settings.max_num_random_bulb_placements and not self.place_bulb(coord, bulbs):
+            coord = get_coord()
             count += 1
 
-        if count < int(self.config.settings["max_num_random_bulb_placements"]):
+        self.num_place_bulb_failures += count
+
+        if count < self.settings.max_num_random_bulb_placements:
+            self.num_place_bulb_calls += count + 1
             return True
 
+        self.num_place_bulb_calls += count
         return False
 
 
-    def write_to_soln_file(self, bulbs):
-        """Writes problem information to the solution file specified in the configuration file."""
-        with open(self.config.settings["soln_file_path"], 'w') as soln_file:
-            soln_file.write(str(self.num_cols) + '\n')
-            soln_file.write(str(self.num_rows) + '\n')
+    def get_soln_text(self, bulbs):
+        """Returns the contents of a solution file for bulbs, a set of coordinates or a Bitboard."""
+        # Ensure the fitness written below belongs to bulbs
+        self.check_valid_solution(bulbs)
+
+        soln_lines = [str(self.num_cols), str(self.num_rows)]
+
+        for coord in sorted(self.black_squares):
+            soln_lines.append(str(coord.y) + ' ' + str(coord.x) + ' ' + str(self.black_squares[coord]))
 
-            for coord in sorted(self.black_squares):
-                soln_file.write(str(coord.y) + ' ' + str(coord.x) + ' ' + str(self.black_squares[coord]) + '\n')
+        soln_lines.append(str(self.get_fitness()))
 
-            soln_file.write(str(len(self.shined_squares)) + '\n')
+        for coord in sorted(bulbs):
+            soln_lines.append(str(coord.y) + ' ' + str(coord.x))
 
-            for coord in sorted(bulbs):
-                soln_file.write(str(coord.y) + ' ' + str(coord.x) + '\n')
+        return '\n'.join(soln_lines) + '\n\n'
 
-            soln_file.write('\n')
+
+    def write_to_soln_file(self, bulbs):
+        """Writes problem information to the solution file specified in the configuration file.
+
+        Where bulbs is a set of coordinates or a Bitboard.
+        """
+        with open(self.settings.soln_file_path, 'w') as soln_file:
+            soln_file.write(self.get_soln_text(bulbs))
 
 
     def get_fitness(self):
@@ -334,4 +603,4 @@ class LightUpPuzzle:
 
         Fitness is defined as the number of lit squares on the board.
         """
-        return len(self.shined_squares)
+        return self.num_shined_squares
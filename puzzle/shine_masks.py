@@ -0,0 +1,36 @@
+class ShineMasks:
+    def __init__(self, puzzle):
+        """Initializes the ShineMasks class.
+
+        Where puzzle is a LightUpPuzzle whose segments have been computed. A ShineMasks object can be
+        indexed like the list of shine masks of the puzzle (see LightUpPuzzle's generate_ray_index()),
+        but computes each mask when it is requested. Every mask is as wide as the board, so on very
+        large boards holding one per cell would take memory quadratic in the number of cells.
+        """
+        self.puzzle = puzzle
+
+
+    def __len__(self):
+        """Returns the number of cells of the puzzle."""
+        return self.puzzle.num_rows * self.puzzle.num_cols
+
+
+    def __getitem__(self, index):
+        """Returns the bitmask of the squares lit by a bulb on the cell with index index (0 for black squares)."""
+        row_segment_id = self.puzzle.row_segment_ids[index]
+
+        if row_segment_id < 0:
+            return 0
+
+        # Row segments are runs of consecutive cell indices
+        row_segment = self.puzzle.row_segments[row_segment_id]
+        row_mask = (1 << len(row_segment)) - 1
+
+        # Column segments are runs of cell indices num_cols apart
+        col_segment = self.puzzle.col_segments[self.puzzle.col_segment_ids[index]]
+        col_mask = 0
+
+        for position in range(len(col_segment)):
+            col_mask |= 1 << (position * self.puzzle.num_cols)
+
+        return (row_mask << row_segment[0]) | (col_mask << col_segment[0])
@@ -0,0 +1,175 @@
+import puzzle.bitboard as bitboard_class
+import time
+
+
+class Solver:
+    def __init__(self, puzzle, max_nodes=0, max_seconds=0.0):
+        """Initializes the Solver class.
+
+        Where puzzle is a LightUpPuzzle whose segments have been computed, max_nodes is the maximum
+        number of search nodes to expand and max_seconds the maximum search time (0 for no limit).
+
+        The solver finds the bulb placement with the highest fitness (see evaluate_bulbs()) by
+        depth first branch and bound over bitmasks of the puzzle's cell indices. Like the EA, it
+        only considers placements holding the puzzle's forced bulbs and no bulbs on squares where
+        place_bulb() never allows one (next to 0-squares, or ruled out by constraint propagation).
+        """
+        self.puzzle = puzzle
+        self.max_nodes = max_nodes
+        self.max_seconds = max_seconds
+        self.enforce_adj_quotas = puzzle.settings.enforce_adj_quotas
+
+        self.white_mask = 0
+        self.forbidden_mask = 0
+
+        for index in range(puzzle.num_rows * puzzle.num_cols):
+            if puzzle.row_segment_ids[index] >= 0:
+                self.white_mask |= 1 << index
+
+            if puzzle.bulb_forbidden[index]:
+                self.forbidden_mask |= 1 << index
+
+        # Squares lit by the forced bulbs, which every placement starts with
+        self.forced_lit_mask = 0
+
+        for index in bitboard_class.mask_indices(puzzle.forced_bulb_mask):
+            self.forced_lit_mask |= puzzle.shine_masks[index]
+
+        # Adjacency quotas and the bitmask of the white neighbours of their black squares
+        self.quotas = []
+
+        if self.enforce_adj_quotas:
+            adj_value_dont_care = puzzle.settings.adj_value_dont_care
+
+            for coord, value in puzzle.black_squares.items():
+                if value < adj_value_dont_care:
+                    adj_mask = 0
+
+                    for adj_coord in puzzle.get_adj_coords(coord):
+                        if not adj_coord in puzzle.black_squares:
+                            adj_mask |= 1 << puzzle.get_index(adj_coord)
+
+                    self.quotas.append((value, adj_mask))
+
+        self.best_bulb_mask = None
+        self.best_num_lit = -1
+        self.optimal = False
+        self.num_nodes = 0
+        self.seconds = 0.0
+
+
+    def propagate_quotas(self, bulb_mask, lit_mask, forbidden_mask):
+        """Applies the adjacency quotas to a search node until nothing changes:
+        squares next to a met quota are forbidden and quotas that need all their candidates get bulbs.
+
+        Returns the resulting (bulb_mask, lit_mask, forbidden_mask), or None if a quota can no longer be met.
+        """
+        changed = True
+
+        while changed:
+            changed = False
+
+            for value, adj_mask in self.quotas:
+                num_bulbs = bin(bulb_mask & adj_mask).count('1')
+                candidate_mask = adj_mask & ~(lit_mask | forbidden_mask)
+                num_candidates = bin(candidate_mask).count('1')
+
+                if num_bulbs > value or num_bulbs + num_candidates < value:
+                    return None
+
+                if not candidate_mask:
+                    continue
+
+                if num_bulbs == value:
+                    forbidden_mask |= candidate_mask
+
+                elif num_bulbs + num_candidates == value:
+                    # Place one bulb at a time, since it may light the other candidates
+                    index = candidate_mask.bit_length() - 1
+                    bulb_mask |= 1 << index
+                    lit_mask |= self.puzzle.shine_masks[index]
+
+                else:
+                    continue
+
+                changed = True
+
+        return bulb_mask, lit_mask, forbidden_mask
+
+
+    def solve(self):
+        """Searches for the best bulb placement until the search completes or a budget runs out.
+
+        Returns the bitmask of the best bulbs found (None if no valid placement was found). The
+        number of squares they light, whether they are proven optimal, the number of expanded
+        nodes and the search time are stored in self.best_num_lit, self.optimal, self.num_nodes
+        and self.seconds.
+        """
+        shine_masks = self.puzzle.shine_masks
+        start_time = time.perf_counter()
+
+        self.best_bulb_mask = None
+        self.best_num_lit = -1
+        self.optimal = True
+        self.num_nodes = 0
+
+        # Every node is a (bulb_mask, lit_mask, forbidden_mask) triple
+        # A square is a candidate for a bulb when it is white and neither lit nor forbidden
+        stack = [(self.puzzle.forced_bulb_mask, self.forced_lit_mask, self.forbidden_mask)]
+
+        while stack:
+            if (self.max_nodes and self.num_nodes >= self.max_nodes) or (self.max_seconds and time.perf_counter() - start_time >= self.max_seconds):
+                self.optimal = False
+                break
+
+            self.num_nodes += 1
+            node = self.propagate_quotas(*stack.pop())
+
+            if node is None:
+                continue
+
+            bulb_mask, lit_mask, forbidden_mask = node
+            candidate_mask = self.white_mask & ~(lit_mask | forbidden_mask)
+            num_lit = bin(lit_mask).count('1')
+
+            # Find the unlit squares that could still be lit, and the one with the fewest lighters
+            num_lightable = 0
+            branch_lighter_mask = 0
+            branch_num_lighters = 0
+
+            for index in bitboard_class.mask_indices(self.white_mask & ~lit_mask):
+                lighter_mask = shine_masks[index] & candidate_mask
+
+                if lighter_mask:
+                    num_lightable += 1
+                    num_lighters = bin(lighter_mask).count('1')
+
+                    if not branch_lighter_mask or num_lighters < branch_num_lighters:
+                        branch_lighter_mask = lighter_mask
+                        branch_num_lighters = num_lighters
+
+            if num_lit + num_lightable <= self.best_num_lit:
+                # Lighting every lightable square could not beat the best placement found so far
+                continue
+
+            if not num_lightable:
+                # No candidates are left, so propagate_quotas() has checked every quota exactly
+                self.best_bulb_mask = bulb_mask
+                self.best_num_lit = num_lit
+                continue
+
+            # Branch on the square with the fewest lighters: either it stays unlit (none of its
+            # lighters get a bulb) or its ith lighter gets a bulb and the lighters before it do not
+            stack.append((bulb_mask, lit_mask, forbidden_mask | branch_lighter_mask))
+
+            branches = []
+
+            for index in bitboard_class.mask_indices(branch_lighter_mask):
+                branches.append((bulb_mask | 1 << index, lit_mask | shine_masks[index], forbidden_mask))
+                forbidden_mask |= 1 << index
+
+            stack.extend(reversed(branches))
+
+        self.seconds = time.perf_counter() - start_time
+
+        return self.best_bulb_mask
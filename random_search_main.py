@@ -3,6 +3,9 @@
 import copy
 import ea.ea_driver as ea_driver_class
 import ea.genotype as genotype_class
+import numpy as np
+import puzzle.batch_evaluator as batch_evaluator_class
+import puzzle.batch_sampler as batch_sampler_class
 import util.args as args_class
 import util.config as config_class
 
@@ -16,36 +19,73 @@ if __name__ == '__main__':
 
     # Setup configuration
     config = config_class.Config(config_file)
+    settings = config.get_settings()
 
 
     # Initialize the EA driver and its run variables
     # Even though it will be used in performing a random search
     ea_driver = ea_driver_class.EADriver(config)
 
+    batch_size = settings.random_search_batch_size
+
 
     # Perform the random search
-    while ea_driver.run_count <= int(config.settings["num_experiment_runs"]):
-        while ea_driver.eval_count <= int(config.settings['num_fitness_evaluations']):
-            ea_driver.eval_count += 1
-
-            genotype = genotype_class.Genotype()
-
-            # Place bulbs until num_bulb_placement_failures failures are reached
-            failure_count = 0
-            while failure_count < int(ea_driver.config.settings['num_bulb_placement_failures']):
-                if not ea_driver.phenotype.place_bulb_randomly(genotype.bulbs):
-                    failure_count += 1
-            
-            ea_driver.phenotype.check_valid_solution(genotype.bulbs)
-            genotype.fitness = ea_driver.phenotype.get_fitness()
-            genotype.fitness_ratio = genotype.fitness / (ea_driver.phenotype.num_rows * ea_driver.phenotype.num_cols - len(ea_driver.phenotype.black_squares))
-            
-            if ea_driver.best_fit_local_genotype.fitness_ratio < genotype.fitness_ratio:
-                ea_driver.best_fit_local_genotype = copy.deepcopy(genotype)
-
-            ea_driver.log.write_run_header(ea_driver.run_count)
-            ea_driver.log.write_run_data(ea_driver.eval_count, 0, ea_driver.best_fit_local_genotype.fitness_ratio)
+    while ea_driver.run_count <= settings.num_experiment_runs:
+        ea_driver.log.write_run_header(ea_driver.run_count)
+
+        if batch_size:
+            # Sample and evaluate batch_size maximal bulb placements at a time
+            batch_sampler = batch_sampler_class.BatchSampler(ea_driver.phenotype)
+            batch_evaluator = batch_evaluator_class.BatchEvaluator(ea_driver.phenotype)
+            rng = np.random.default_rng(ea_driver.seed.get_stream_seed(ea_driver.run_count, 'random_search'))
+
+            while ea_driver.eval_count < settings.num_fitness_evaluations:
+                num_samples = min(batch_size, settings.num_fitness_evaluations - ea_driver.eval_count)
+
+                bulb_matrix = batch_sampler.sample(num_samples, rng)
+                fitnesses, fitness_ratios = batch_evaluator.evaluate(bulb_matrix)[:2]
+
+                # Best fitness seen so far after each evaluation of the batch
+                best_fitness_ratios = np.maximum.accumulate(np.maximum(fitness_ratios, ea_driver.best_fit_local_genotype.fitness_ratio))
+
+                best_index = int(np.argmax(fitness_ratios))
+
+                if ea_driver.best_fit_local_genotype.fitness_ratio < fitness_ratios[best_index]:
+                    ea_driver.best_fit_local_genotype = genotype_class.Genotype(ea_driver.phenotype.create_bulbs(batch_evaluator.get_bulb_mask(bulb_matrix[best_index])))
+                    ea_driver.best_fit_local_genotype.fitness = int(fitnesses[best_index])
+                    ea_driver.best_fit_local_genotype.fitness_ratio = float(fitness_ratios[best_index])
+
+                for best_fitness_ratio in best_fitness_ratios.tolist():
+                    ea_driver.eval_count += 1
+                    ea_driver.log.write_run_data(ea_driver.eval_count, 0, best_fitness_ratio)
+
+        else:
+            rng = ea_driver.seed.get_random(ea_driver.run_count, 'random_search')
+
+            while ea_driver.eval_count < settings.num_fitness_evaluations:
+                ea_driver.eval_count += 1
+
+                genotype = genotype_class.Genotype(ea_driver.phenotype.create_bulbs())
+
+                # Place bulbs until num_bulb_placement_failures failures are reached
+                failure_count = 0
+                while failure_count < settings.num_bulb_placement_failures:
+                    if not ea_driver.phenotype.place_bulb_randomly(genotype.bulbs, rng):
+                        failure_count += 1
+
+                ea_driver.phenotype.check_valid_solution(genotype.bulbs)
+                genotype.fitness = ea_driver.phenotype.get_fitness()
+                genotype.fitness_ratio = genotype.fitness / (ea_driver.phenotype.num_rows * ea_driver.phenotype.num_cols - len(ea_driver.phenotype.black_squares))
+
+                if ea_driver.best_fit_local_genotype.fitness_ratio < genotype.fitness_ratio:
+                    ea_driver.best_fit_local_genotype = copy.deepcopy(genotype)
+
+                ea_driver.log.write_run_data(ea_driver.eval_count, 0, ea_driver.best_fit_local_genotype.fitness_ratio)
 
         ea_driver.init_run_variables()
         ea_driver.increment_run_count()
-          
\ No newline at end of file
+
+
+    # Stop the evaluation workers and write any log records still held in memory
+    ea_driver.shutdown()
+    ea_driver.log.close()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+
+import puzzle.corpus as corpus_class
+import puzzle.light_up_puzzle as puzzle_class
+import puzzle.solver as solver_class
+import util.args as args_class
+import util.config as config_class
+import util.seed as seed_class
+
+
+if __name__ == '__main__':
+
+    # Process command line arguments
+    args = args_class.Arguments(1, ['config/default.cfg'])
+    config_file = args.get_args()[0]
+
+
+    # Setup configuration
+    config = config_class.Config(config_file)
+    settings = config.get_settings()
+
+
+    # Create the puzzle the first run of an experiment would generate, or load it from the corpus (its
+    # first instance if corpus_instance_id is -1)
+    if settings.corpus_file_path:
+        corpus = corpus_class.Corpus(settings.corpus_file_path)
+        phenotype = puzzle_class.LightUpPuzzle(config, corpus.get_board(max(settings.corpus_instance_id, 0)))
+
+    else:
+        phenotype = puzzle_class.LightUpPuzzle(config, rng=seed_class.Seed(config).get_random(1, 'puzzle'))
+    num_white_squares = phenotype.num_rows * phenotype.num_cols - len(phenotype.black_squares)
+
+
+    # Solve it exactly, within the configured budgets
+    solver = solver_class.Solver(phenotype, settings.solver_max_nodes, settings.solver_max_seconds)
+    bulb_mask = solver.solve()
+
+    if bulb_mask is None:
+        print('No valid bulb placement found')
+
+    else:
+        print(phenotype.get_soln_text(phenotype.create_bulbs(bulb_mask)))
+
+    print('best lit count: %i of %i white squares (%s)' % (max(solver.best_num_lit, 0), num_white_squares, 'optimal' if solver.optimal else 'budget exhausted, not proven optimal'))
+    print('solve time: %.6f s (%i nodes)' % (solver.seconds, solver.num_nodes))
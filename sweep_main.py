@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+
+import ea.sweep as sweep_class
+import util.args as args_class
+
+
+if __name__ == '__main__':
+
+    # Process command line arguments
+    args = args_class.Arguments(1, ['config/sweep.cfg'])
+    sweep_file = args.get_args()[0]
+
+
+    # Setup the sweep
+    sweep = sweep_class.Sweep(sweep_file)
+
+
+    # Perform every run not already in the results store
+    num_processes = int(sweep.settings['num_sweep_processes'])
+    sweep.perform(num_processes if num_processes > 0 else None)
+
+
+    # Summarize the results
+    for cell_id, num_runs, mean_best_fitness, mean_num_evals in sweep.get_summary():
+        print('%s\t%i runs\tmean best fitness %f\tmean evals %.1f' % (cell_id, num_runs, mean_best_fitness, mean_num_evals))
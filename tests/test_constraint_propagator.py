@@ -0,0 +1,58 @@
+import puzzle.constraint_propagator as constraint_propagator_class
+import puzzle.light_up_puzzle as puzzle_class
+import puzzle.solver as solver_class
+import random
+import util.config as config_class
+
+
+def create_puzzle(seed, use_constraint_propagation):
+    """Returns a random 7x7 puzzle of the bonus config with the adjacency quotas enforced."""
+    config = config_class.Config('config/random_gen_BONUS.cfg')
+
+    overrides = {
+        'override_random_board_dimensions': '1',
+        'override_num_rows': '7',
+        'override_num_cols': '7',
+        'enforce_adj_quotas': '1',
+        'use_constraint_propagation': use_constraint_propagation
+    }
+
+    for key, value in overrides.items():
+        config.set(key, value)
+
+    return puzzle_class.LightUpPuzzle(config, rng=random.Random(seed))
+
+
+def get_solver_num_lit(puzzle):
+    """Returns the most squares a placement meeting the adjacency quotas lights (-1 for none)."""
+    solver = solver_class.Solver(puzzle)
+    solver.solve()
+
+    assert solver.optimal
+
+    return solver.best_num_lit
+
+
+def test_propagation_keeps_quota_solvable_board_solvable():
+    # Seed 4 once got three forced bulbs around a black 1, as a rule assumed the whole board is lit
+    assert get_solver_num_lit(create_puzzle(4, '1')) == get_solver_num_lit(create_puzzle(4, '0')) == 36
+
+
+def test_forced_bulbs_meet_adjacency_quotas():
+    for seed in range(40):
+        puzzle = create_puzzle(seed, '0')
+        propagator = constraint_propagator_class.ConstraintPropagator(puzzle)
+
+        if not propagator.propagate():
+            # A contradiction leaves only the squares next to 0-squares ruled out
+            assert propagator.bulb_mask == 0
+
+        for value, adj_indices in propagator.quota_squares:
+            assert len([index for index in adj_indices if propagator.bulb_mask >> index & 1]) <= value
+
+        # No forced bulb lights another one
+        for index in range(puzzle.num_rows * puzzle.num_cols):
+            if propagator.bulb_mask >> index & 1:
+                assert propagator.bulb_mask & puzzle.shine_masks[index] == 1 << index
+
+        assert get_solver_num_lit(create_puzzle(seed, '1')) == get_solver_num_lit(puzzle)
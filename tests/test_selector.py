@@ -0,0 +1,44 @@
+import ea.genotype as genotype_class
+import ea.selector as selector_class
+
+
+def create_tied_genotypes(num_genotypes):
+    """Returns a list of num_genotypes genotypes that all have the same fitness."""
+    genotypes = []
+
+    for _ in range(num_genotypes):
+        genotype = genotype_class.Genotype()
+        genotype.fitness = 10
+        genotype.fitness_ratio = 0.5
+        genotypes.append(genotype)
+
+    return genotypes
+
+
+def test_tied_genotypes_are_selected_uniformly():
+    num_genotypes = 20
+    num_selections = 40000
+    genotypes = create_tied_genotypes(num_genotypes)
+    selector = selector_class.Selector(1)
+
+    for select in (lambda: selector.select_with_replacement(genotypes, 2, 1), lambda: selector.select_without_replacement(genotypes, 2, 1)):
+        counts = dict((id(genotype), 0) for genotype in genotypes)
+
+        for _ in range(num_selections):
+            for winner in select():
+                counts[id(winner)] += 1
+
+        # Each genotype is expected to win 2000 times (with a standard deviation of about 44)
+        expected_count = num_selections / num_genotypes
+        assert all(abs(count - expected_count) < 0.1 * expected_count for count in counts.values())
+
+
+def test_last_tied_child_survives():
+    # Survival selection draws without replacement from the population followed by the children
+    genotypes = create_tied_genotypes(10)
+    selector = selector_class.Selector(2)
+
+    num_survivals = sum(genotypes[-1] in selector.select_without_replacement(genotypes, 2, 5) for _ in range(2000))
+
+    # Half of the genotypes survive, so the last one is expected to survive 1000 times
+    assert 850 < num_survivals < 1150
@@ -0,0 +1,67 @@
+import puzzle.light_up_puzzle as puzzle_class
+import puzzle.solver as solver_class
+import random
+import util.config as config_class
+
+
+def create_puzzle(seed, use_constraint_propagation):
+    """Returns a random 6x6 puzzle with many 0-squares and the adjacency quotas disabled."""
+    config = config_class.Config('config/default.cfg')
+
+    overrides = {
+        'generate_uniform_random_puzzle': '1',
+        'override_random_board_dimensions': '1',
+        'override_num_rows': '6',
+        'override_num_cols': '6',
+        'enforce_adj_quotas': '0',
+        'use_constraint_propagation': use_constraint_propagation,
+        'black_square_value_weights': '5,1,1,1,1,5'
+    }
+
+    for key, value in overrides.items():
+        config.set(key, value)
+
+    return puzzle_class.LightUpPuzzle(config, rng=random.Random(seed))
+
+
+def get_brute_force_num_lit(puzzle):
+    """Returns the most squares any legal bulb placement lights, by enumerating every placement
+    that holds the forced bulbs and no bulb on a forbidden square or on a lit square.
+    """
+    allowed_indices = [index for index in range(puzzle.num_rows * puzzle.num_cols) if not puzzle.bulb_forbidden[index]]
+    forced_lit_mask = 0
+
+    for index in range(puzzle.num_rows * puzzle.num_cols):
+        if puzzle.forced_bulb_mask >> index & 1:
+            forced_lit_mask |= puzzle.shine_masks[index]
+
+    def search(position, lit_mask):
+        """Returns the most squares lit by placing bulbs on allowed_indices[position:]."""
+        if position == len(allowed_indices):
+            return bin(lit_mask).count('1')
+
+        index = allowed_indices[position]
+        best_num_lit = search(position + 1, lit_mask)
+
+        if not lit_mask >> index & 1:
+            best_num_lit = max(best_num_lit, search(position + 1, lit_mask | puzzle.shine_masks[index]))
+
+        return best_num_lit
+
+    return search(0, forced_lit_mask)
+
+
+def test_solver_matches_brute_force():
+    for use_constraint_propagation in ('0', '1'):
+        for seed in range(60):
+            puzzle = create_puzzle(seed, use_constraint_propagation)
+            solver = solver_class.Solver(puzzle)
+            bulb_mask = solver.solve()
+
+            assert solver.optimal
+            assert solver.best_num_lit == get_brute_force_num_lit(puzzle)
+
+            # The solution is a legal placement the EA could reach
+            assert bulb_mask & puzzle.forced_bulb_mask == puzzle.forced_bulb_mask
+            assert not [index for index in range(puzzle.num_rows * puzzle.num_cols) if bulb_mask >> index & 1 and puzzle.bulb_forbidden[index] and not puzzle.forced_bulb_mask >> index & 1]
+            assert puzzle.evaluate_bulbs(puzzle.create_bulbs(bulb_mask))[0] == solver.best_num_lit
@@ -1,4 +1,5 @@
 import configparser
+import util.settings as settings_class
 
 
 class Config:
@@ -13,3 +14,22 @@ class Config:
         # Remove the reference to the DEFAULT section for ease of use
         # (i.e. direct access of config settings from self.settings)
         self.settings = self.settings['DEFAULT'] 
+
+        self.typed_settings = None
+
+
+    def set(self, key, value):
+        """Sets config setting key to the string value, replacing any value read from the config file."""
+        self.settings[key] = value
+        self.typed_settings = None
+
+
+    def get_settings(self):
+        """Returns the typed and validated Settings of this config (see Settings).
+
+        They are parsed on the first call and cached until set() is called.
+        """
+        if self.typed_settings is None:
+            self.typed_settings = settings_class.Settings.from_config(self)
+
+        return self.typed_settings
@@ -1,16 +1,43 @@
+import random
 import time
 
 
 class Seed:
-    def __init__(self, config):
+    def __init__(self, config, val=None):
         """Initializes the Seed class.
         
-        Where config is a Config object.
+        Where config is a Config object. If val is given, it is used as the seed instead of the
+        config's (so that worker processes share the seed of the experiment).
         """
         self.config = config
 
-        if int(self.config.settings['use_external_seed']):
-            self.val = float(self.config.settings['seed'])
+        if val is not None:
+            self.val = val
+
+        elif self.config.get_settings().use_external_seed:
+            self.val = self.config.get_settings().seed
         
         else:
             self.val = time.time()
+
+
+    def get_stream_seed(self, run_count, stream_name, stream_key=None):
+        """Returns a deterministic integer seed for the random number stream named stream_name (such as
+        'puzzle' or 'operators') of run number run_count and, if given, of stream_key (an island
+        index or a sweep cell id, separating populations that share a seed and run).
+
+        Every component draws from its own stream, so the numbers drawn by one component do not
+        depend on how many another has drawn, and every run and island can be reproduced on its
+        own, in any process, from the logged seed.
+        """
+        stream_id = str(self.val) + ':' + str(run_count)
+
+        if stream_key is not None:
+            stream_id += ':' + str(stream_key)
+
+        return random.Random(stream_id + ':' + stream_name).getrandbits(64)
+
+
+    def get_random(self, run_count, stream_name, stream_key=None):
+        """Returns a random.Random instance seeded with get_stream_seed(run_count, stream_name, stream_key)."""
+        return random.Random(self.get_stream_seed(run_count, stream_name, stream_key))
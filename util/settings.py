@@ -0,0 +1,165 @@
+import dataclasses
+
+
+@dataclasses.dataclass(frozen=True)
+class Settings:
+    """The typed configuration values of an experiment (see config/default.cfg for their meaning).
+
+    Every field is read from the config key of the same name (or the key in its 'key' metadata),
+    so values are parsed and validated once instead of on every use. Keys missing from the config
+    take the defaults below.
+    """
+    # General EA parameters
+    mu: int = 20
+    offspring_pool_size: int = dataclasses.field(default=5, metadata={'key': 'lambda'})
+    enforce_adj_quotas: bool = False
+    num_experiment_runs: int = 30
+    num_fitness_evaluations: int = 10000
+    n_termination_convergence_criterion: int = 500
+    termination_convergence_criterion_magnitude: float = 1e-4
+    num_experiment_processes: int = 1
+    num_islands: int = 1
+    migration_interval: int = 10
+    num_migrants: int = 2
+    migration_topology: str = 'ring'
+
+    # Parent selection
+    parent_population_size: int = 20
+    use_fitness_proportional_selection: bool = False
+    k_parent_selection: int = 2
+
+    # Survival selection
+    use_truncation: bool = False
+    k_survival_selection: int = 2
+
+    # Recombination
+    n_point_crossover: int = 3
+    parent_selection_weight: float = 0.5
+
+    # Mutation
+    mutation_probability: float = 0.5
+    rand_num_bulb_shuffles: int = 5
+    num_bulb_placement_failures_mutation: int = 1
+
+    # File paths
+    input_file_path: str = 'input/a1.txt'
+    log_file_path: str = 'output/default_log.txt'
+    soln_file_path: str = 'output/default_soln.txt'
+    corpus_file_path: str = ''
+    corpus_instance_id: int = -1
+    checkpoint_file_path: str = ''
+    checkpoint_interval: int = 100
+    log_format: str = 'text'
+    log_flush_interval: int = 1000
+    log_print_interval: int = 1
+    enable_profiling: bool = False
+    profile_file_path: str = ''
+
+    # General initialization
+    force_validity: bool = False
+    use_constraint_propagation: bool = False
+    num_solver_seeded_genotypes: int = 0
+    solver_max_nodes: int = 1000000
+    solver_max_seconds: float = 60.0
+    num_bulb_placement_failures: int = 1
+    use_external_seed: bool = False
+    seed: float = 0.0
+    use_bitboard_genotype: bool = True
+    use_incremental_evaluation: bool = True
+    use_batch_evaluation: bool = False
+    num_evaluation_processes: int = 1
+    evaluation_chunk_size: int = 64
+    fitness_cache_size: int = 4096
+    random_search_batch_size: int = 0
+
+    # Random puzzle initialization
+    generate_uniform_random_puzzle: bool = True
+    black_square_placement_prob: float = 0.2
+    bulb_placement_prob: float = 0.3
+    min_random_board_dimension: int = 3
+    max_random_board_dimension: int = 10
+    override_random_board_dimensions: bool = True
+    override_num_rows: int = 3
+    override_num_cols: int = 3
+    black_square_value_weights: tuple = (1, 5, 3, 2, 2, 15)
+
+    # Algorithm parameters & constants
+    adj_value_dont_care: int = 5
+    max_num_random_bulb_placements: int = 1
+
+
+    @classmethod
+    def from_config(cls, config):
+        """Returns the Settings of config, a Config object.
+
+        Raises a ValueError naming the config key if a value cannot be parsed or is out of range.
+        """
+        values = {}
+
+        for field in dataclasses.fields(cls):
+            key = field.metadata.get('key', field.name)
+
+            if key not in config.settings:
+                continue
+
+            value = config.settings[key]
+
+            try:
+                if field.type is bool:
+                    values[field.name] = bool(int(value))
+                elif field.type is tuple:
+                    values[field.name] = tuple(int(v) for v in value.split(','))
+                else:
+                    values[field.name] = field.type(value)
+
+            except ValueError:
+                raise ValueError('config key ' + key + ' has invalid value ' + repr(value) + ' (expected ' + field.type.__name__ + ')')
+
+        return cls(**values)
+
+
+    def __post_init__(self):
+        """Checks that every value is within its valid range."""
+        checks = [
+            ('mu', self.mu >= 1, 'must be at least 1'),
+            ('lambda', self.offspring_pool_size >= 1, 'must be at least 1'),
+            ('num_experiment_runs', self.num_experiment_runs >= 0, 'must not be negative'),
+            ('num_fitness_evaluations', self.num_fitness_evaluations >= 0, 'must not be negative'),
+            ('n_termination_convergence_criterion', self.n_termination_convergence_criterion >= 1, 'must be at least 1'),
+            ('num_experiment_processes', self.num_experiment_processes >= 0, 'must not be negative'),
+            ('num_islands', self.num_islands >= 1, 'must be at least 1'),
+            ('migration_interval', self.migration_interval >= 1, 'must be at least 1'),
+            ('num_migrants', 0 <= self.num_migrants <= self.mu, 'must be between 0 and mu'),
+            ('migration_topology', self.migration_topology in ('ring', 'random'), 'must be ring or random'),
+            ('parent_population_size', self.parent_population_size >= 1, 'must be at least 1'),
+            ('k_parent_selection', self.k_parent_selection >= 1, 'must be at least 1'),
+            ('k_survival_selection', 1 <= self.k_survival_selection <= self.mu + self.offspring_pool_size, 'must be between 1 and mu + lambda (tournaments are without replacement)'),
+            ('n_point_crossover', self.n_point_crossover >= 0, 'must not be negative'),
+            ('parent_selection_weight', 0 <= self.parent_selection_weight <= 1, 'must be a probability'),
+            ('mutation_probability', 0 <= self.mutation_probability <= 1, 'must be a probability'),
+            ('rand_num_bulb_shuffles', self.rand_num_bulb_shuffles >= 1, 'must be at least 1'),
+            ('corpus_instance_id', self.corpus_instance_id >= -1, 'must be -1 or an instance id'),
+            ('checkpoint_interval', self.checkpoint_interval >= 1, 'must be at least 1'),
+            ('log_format', self.log_format in ('text', 'binary'), 'must be text or binary'),
+            ('log_flush_interval', self.log_flush_interval >= 0, 'must not be negative'),
+            ('log_print_interval', self.log_print_interval >= 0, 'must not be negative'),
+            ('num_solver_seeded_genotypes', 0 <= self.num_solver_seeded_genotypes <= self.mu, 'must be between 0 and mu'),
+            ('solver_max_nodes', self.solver_max_nodes >= 0, 'must not be negative'),
+            ('solver_max_seconds', self.solver_max_seconds >= 0, 'must not be negative'),
+            ('num_evaluation_processes', self.num_evaluation_processes >= 0, 'must not be negative'),
+            ('evaluation_chunk_size', self.evaluation_chunk_size >= 1, 'must be at least 1'),
+            ('fitness_cache_size', self.fitness_cache_size >= 0, 'must not be negative'),
+            ('random_search_batch_size', self.random_search_batch_size >= 0, 'must not be negative'),
+            ('black_square_placement_prob', 0 <= self.black_square_placement_prob <= 1, 'must be a probability'),
+            ('bulb_placement_prob', 0 <= self.bulb_placement_prob <= 1, 'must be a probability'),
+            ('min_random_board_dimension', 1 <= self.min_random_board_dimension <= self.max_random_board_dimension, 'must be between 1 and max_random_board_dimension'),
+            ('override_num_rows', self.override_num_rows >= 1, 'must be at least 1'),
+            ('override_num_cols', self.override_num_cols >= 1, 'must be at least 1'),
+            ('black_square_value_weights', len(self.black_square_value_weights) == self.adj_value_dont_care + 1 and min(self.black_square_value_weights) >= 0 and sum(self.black_square_value_weights) > 0, 'must hold adj_value_dont_care + 1 non-negative weights, not all zero'),
+            ('adj_value_dont_care', self.adj_value_dont_care >= 0, 'must not be negative'),
+            ('max_num_random_bulb_placements', self.max_num_random_bulb_placements >= 1, 'must be at least 1')
+        ]
+
+        for key, valid, message in checks:
+            if not valid:
+                raise ValueError('config key ' + key + ' ' + message)